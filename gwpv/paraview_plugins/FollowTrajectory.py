@@ -1,6 +1,5 @@
 # Follow Trajectory Paraview filter
 
-import itertools
 import logging
 
 import numpy as np
@@ -12,6 +11,7 @@ from vtkmodules.util.vtkAlgorithm import VTKPythonAlgorithmBase
 from vtkmodules.vtkCommonDataModel import vtkPolyData
 
 import gwpv.plugin_util.timesteps as timesteps_util
+from gwpv.trajectory import TrajectoryInterpolant
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +24,10 @@ class FollowTrajectory(VTKPythonAlgorithmBase):
         VTKPythonAlgorithmBase.__init__(
             self, nInputPorts=1, nOutputPorts=1, outputType="vtkPolyData"
         )
+        self.interpolation_order = 1
+        # Interpolant of the trajectory data and the input state it was built
+        # for, so it is built only once
+        self._interpolant = (None, None)
 
     def FillInputPortInformation(self, port, info):
         info.Set(self.INPUT_REQUIRED_DATA_TYPE(), "vtkPolyData")
@@ -47,6 +51,48 @@ class FollowTrajectory(VTKPythonAlgorithmBase):
     def GetTimestepValues(self):
         return self._get_timesteps().tolist()
 
+    # Interpolate along the trajectory linearly or with smooth cubic Hermite
+    # polynomials
+    @smproperty.intvector(name="InterpolationOrder", default_values=1)
+    @smdomain.xml(
+        '<EnumerationDomain name="enum">'
+        '<Entry value="1" text="Linear"/>'
+        '<Entry value="3" text="Cubic"/>'
+        "</EnumerationDomain>"
+    )
+    def SetInterpolationOrder(self, value):
+        self.interpolation_order = value
+        self.Modified()
+
+    def _get_interpolant(self, trajectory_data):
+        interpolant_id = (
+            trajectory_data.VTKObject.GetMTime(),
+            self.interpolation_order,
+        )
+        cached_id, interpolant = self._interpolant
+        if cached_id == interpolant_id:
+            return interpolant
+        logger.debug("Building trajectory interpolant...")
+        trajectory_times = trajectory_data.PointData["Time"]
+        columns = {"Points": trajectory_data.Points}
+        for dataset in trajectory_data.PointData.keys():
+            if dataset == "Time":
+                continue
+            point_data = trajectory_data.PointData[dataset]
+            if len(point_data) != len(trajectory_times):
+                logger.warning(
+                    f"Unable to interpolate trajectory dataset {dataset}:"
+                    f" Length of dataset ({len(point_data)}) does not match"
+                    f" length of trajectory times ({len(trajectory_times)})."
+                )
+                continue
+            columns[dataset] = point_data
+        interpolant = TrajectoryInterpolant(
+            trajectory_times, columns, order=self.interpolation_order
+        )
+        self._interpolant = (interpolant_id, interpolant)
+        return interpolant
+
     def RequestInformation(self, request, inInfo, outInfo):
         logger.debug("Requesting information...")
         # This needs the time data from the trajectory file, so we may have to
@@ -64,15 +110,10 @@ class FollowTrajectory(VTKPythonAlgorithmBase):
         # Retrieve current time
         time = timesteps_util.get_timestep(self, logger=logger)
 
-        # Retrieve trajectory data
-        trajectory_times = trajectory_data.PointData["Time"]
-        trajectory_points = trajectory_data.Points
-
-        # Interpolate along the trajectory to find current position
-        current_position = [
-            np.interp(time, trajectory_times, trajectory_points[:, i])
-            for i in range(3)
-        ]
+        # Interpolate all data along the trajectory to the current time at once
+        interpolant = self._get_interpolant(trajectory_data)
+        data_at_position = interpolant(time)
+        current_position = data_at_position.pop("Points")
 
         # Expose to VTK
         points_vtk = vtk.vtkPoints()
@@ -83,29 +124,16 @@ class FollowTrajectory(VTKPythonAlgorithmBase):
         output.SetPoints(points_vtk)
         output.SetVerts(verts_vtk)
 
-        # Interpolate remaining point data along the trajectory
+        # Add remaining point data along the trajectory. Datasets that can't be
+        # interpolated are zero.
         for dataset in trajectory_data.PointData.keys():
             if dataset == "Time":
                 continue
-            point_data = trajectory_data.PointData[dataset]
-            data_at_position = np.zeros(point_data.shape[1:])
-            if len(data_at_position.shape) > 0:
-                for i in itertools.product(*map(range, data_at_position.shape)):
-                    point_data_i = point_data[(slice(None),) + i]
-                    if len(trajectory_times) == len(point_data_i):
-                        data_at_position[i] = np.interp(
-                            time, trajectory_times, point_data_i
-                        )
-                    else:
-                        logger.warning(
-                            "Unable to interpolate trajectory dataset"
-                            f" {dataset}[{i}]: Length of dataset"
-                            f" ({len(point_data_i)}) does not match length of"
-                            f" trajectory times ({len(trajectory_times)})."
-                        )
+            if dataset in data_at_position:
+                data = data_at_position[dataset]
             else:
-                data_at_position = np.interp(time, trajectory_times, point_data)
-            data_vtk = vtknp.numpy_to_vtk(np.array([data_at_position]))
+                data = np.zeros(trajectory_data.PointData[dataset].shape[1:])
+            data_vtk = vtknp.numpy_to_vtk(np.array([data]))
             data_vtk.SetName(dataset)
             output.GetPointData().AddArray(data_vtk)
         return 1
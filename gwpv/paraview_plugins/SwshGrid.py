@@ -64,6 +64,17 @@ class SwshGrid(VTKPythonAlgorithmBase):
         self.clip_y_normal = value
         self.Modified()
 
+    @smproperty.intvector(name="Precision", default_values=64)
+    @smdomain.xml(
+        '<EnumerationDomain name="enum">'
+        '<Entry value="32" text="Single"/>'
+        '<Entry value="64" text="Double"/>'
+        "</EnumerationDomain>"
+    )
+    def SetPrecision(self, value):
+        self.precision = value
+        self.Modified()
+
     @smproperty.stringvector(name="SwshCacheDirectory", default_values="")
     def SetSwshCacheDirectory(self, value):
         self.swsh_cache_dir = value
@@ -112,7 +123,9 @@ class SwshGrid(VTKPythonAlgorithmBase):
             clip_y_normal=self.clip_y_normal,
             clip_z_normal=False,
             cache_dir=self.swsh_cache_dir,
+            dtype=swsh_cache.complex_dtype(self.precision),
         )
+        r = r.astype(np.finfo(swsh_grid.dtype).dtype, copy=False)
 
         # Expose radial coordinate to VTK
         r_vtk = vtknp.numpy_to_vtk(r, deep=False)
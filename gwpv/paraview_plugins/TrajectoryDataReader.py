@@ -70,39 +70,48 @@ class TrajectoryDataReader(VTKPythonAlgorithmBase):
         logger.debug("Requesting data...")
         output = dsa.WrapDataObject(vtkPolyData.GetData(outInfo))
 
+        # Read all datasets with a single pass over the file
         with h5py.File(self._filename, "r") as trajectory_file:
             subfile = trajectory_file[self._subfile]
             coords = np.array(subfile[self._coords_dataset])
-        coords[:, 1:] *= self._radial_scale
+            datasets = {
+                dataset.replace(".dat", ""): subfile[dataset][:, 1:]
+                for dataset in subfile
+                if dataset != self._coords_dataset
+            }
+        num_points = len(coords)
         logger.debug(f"Loaded coordinates with shape {coords.shape}.")
 
-        # Construct a line of points
+        # Construct a line of points from the coordinates in bulk
         points_vtk = vtk.vtkPoints()
-        # Each ID is composed of (1) the order of the point in the line and (2)
-        # the index in the `vtkPoints` constructed above
-        line_vtk = vtk.vtkPolyLine()
-        point_ids = line_vtk.GetPointIds()
-        point_ids.SetNumberOfIds(len(coords))
-        for i, point in enumerate(coords):
-            points_vtk.InsertPoint(i, *point[1:])
-            point_ids.SetId(i, i)
+        points_vtk.SetData(
+            vtknp.numpy_to_vtk(
+                np.ascontiguousarray(coords[:, 1:] * self._radial_scale),
+                deep=True,
+            )
+        )
         output.SetPoints(points_vtk)
-        # Set the line ordering as "cell data"
-        output.Allocate(1, 1)
-        output.InsertNextCell(line_vtk.GetCellType(), line_vtk.GetPointIds())
+        # Set the line ordering as "cell data". The line is a single cell that
+        # connects all points in order.
+        cells_vtk = vtk.vtkCellArray()
+        cells_vtk.SetData(
+            vtknp.numpy_to_vtkIdTypeArray(
+                np.array([0, num_points], dtype=vtknp.ID_TYPE_CODE), deep=True
+            ),
+            vtknp.numpy_to_vtkIdTypeArray(
+                np.arange(num_points, dtype=vtknp.ID_TYPE_CODE), deep=True
+            ),
+        )
+        output.SetLines(cells_vtk)
 
         # Add time data to the points
-        time = vtknp.numpy_to_vtk(coords[:, 0])
+        time = vtknp.numpy_to_vtk(np.ascontiguousarray(coords[:, 0]), deep=True)
         time.SetName("Time")
         output.GetPointData().AddArray(time)
 
         # Add remaining datasets from file to trajectory points
-        with h5py.File(self._filename, "r") as trajectory_file:
-            subfile = trajectory_file[self._subfile]
-            for dataset in subfile:
-                if dataset == self._coords_dataset:
-                    continue
-                dataset_vtk = vtknp.numpy_to_vtk(subfile[dataset][:, 1:])
-                dataset_vtk.SetName(dataset.replace(".dat", ""))
-                output.GetPointData().AddArray(dataset_vtk)
+        for dataset_name, dataset in datasets.items():
+            dataset_vtk = vtknp.numpy_to_vtk(dataset, deep=True)
+            dataset_vtk.SetName(dataset_name)
+            output.GetPointData().AddArray(dataset_vtk)
         return 1
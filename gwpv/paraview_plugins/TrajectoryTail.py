@@ -3,6 +3,7 @@
 import logging
 
 import numpy as np
+from paraview import vtk
 from paraview.util.vtkAlgorithm import smdomain, smproperty, smproxy
 from paraview.vtk.util import numpy_support as vtknp
 from vtkmodules.numpy_interface import dataset_adapter as dsa
@@ -10,6 +11,7 @@ from vtkmodules.util.vtkAlgorithm import VTKPythonAlgorithmBase
 from vtkmodules.vtkCommonDataModel import vtkPolyData
 
 import gwpv.plugin_util.timesteps as timesteps_util
+from gwpv.waveform_data import time_window
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +24,7 @@ class TrajectoryTail(VTKPythonAlgorithmBase):
         VTKPythonAlgorithmBase.__init__(
             self, nInputPorts=1, nOutputPorts=1, outputType="vtkPolyData"
         )
+        self.max_age = 0.0
 
     def FillInputPortInformation(self, port, info):
         info.Set(self.INPUT_REQUIRED_DATA_TYPE(), "vtkPolyData")
@@ -45,6 +48,13 @@ class TrajectoryTail(VTKPythonAlgorithmBase):
     def GetTimestepValues(self):
         return self._get_timesteps().tolist()
 
+    # Only output the part of the trajectory that is at most this old. Set to 0
+    # to output the full trajectory.
+    @smproperty.doublevector(name="MaxAge", default_values=0.0)
+    def SetMaxAge(self, value):
+        self.max_age = value
+        self.Modified()
+
     def RequestInformation(self, request, inInfo, outInfo):
         logger.debug("Requesting information...")
         # This needs the time data from the trajectory file, so we may have to
@@ -59,14 +69,46 @@ class TrajectoryTail(VTKPythonAlgorithmBase):
         trajectory_data = dsa.WrapDataObject(input)
         output = dsa.WrapDataObject(vtkPolyData.GetData(outInfo))
 
-        # Shallow-copy input trajectory data to output
-        output.ShallowCopy(input)
-
         # Retrieve current time
         time = timesteps_util.get_timestep(self, logger=logger)
 
+        point_times = trajectory_data.PointData["Time"]
+        if self.max_age <= 0.0:
+            # Shallow-copy input trajectory data to output
+            output.ShallowCopy(input)
+            age = time - point_times
+        else:
+            # Output only the slice of points within the tail, found by a
+            # binary search in the sorted times. The point data references the
+            # input arrays without copying.
+            window = time_window(point_times, time - self.max_age, time)
+            num_points = window.stop - window.start
+            logger.debug(f"Tail has {num_points} points in {window}.")
+            points_vtk = vtk.vtkPoints()
+            points_vtk.SetData(
+                vtknp.numpy_to_vtk(trajectory_data.Points[window], deep=False)
+            )
+            output.SetPoints(points_vtk)
+            cells_vtk = vtk.vtkCellArray()
+            cells_vtk.SetData(
+                vtknp.numpy_to_vtkIdTypeArray(
+                    np.array([0, num_points], dtype=vtknp.ID_TYPE_CODE),
+                    deep=True,
+                ),
+                vtknp.numpy_to_vtkIdTypeArray(
+                    np.arange(num_points, dtype=vtknp.ID_TYPE_CODE), deep=True
+                ),
+            )
+            output.SetLines(cells_vtk)
+            for dataset in trajectory_data.PointData.keys():
+                data_vtk = vtknp.numpy_to_vtk(
+                    trajectory_data.PointData[dataset][window], deep=False
+                )
+                data_vtk.SetName(dataset)
+                output.GetPointData().AddArray(data_vtk)
+            age = time - point_times[window]
+
         # Add age data to the points
-        age = time - trajectory_data.PointData["Time"]
         age_vtk = vtknp.numpy_to_vtk(age, deep=True)
         age_vtk.SetName("Age")
         output.GetPointData().AddArray(age_vtk)
@@ -3,27 +3,32 @@
 import logging
 import time
 
-import h5py
+import numpy as np
 from paraview.util.vtkAlgorithm import smdomain, smhint, smproperty, smproxy
 from paraview.vtk.util import keys as vtkkeys
 from paraview.vtk.util import numpy_support as vtknp
 from vtkmodules.numpy_interface import dataset_adapter as dsa
 from vtkmodules.util.vtkAlgorithm import VTKPythonAlgorithmBase
+from vtkmodules.vtkCommonCore import vtkDataArraySelection
 from vtkmodules.vtkCommonDataModel import vtkTable
 
+import gwpv.plugin_util.data_array_selection as das_util
+from gwpv import waveform_data
+from gwpv.waveform_formats import open_waveform_file
+
 logger = logging.getLogger(__name__)
 
 
 @smproxy.reader(
     name="WaveformDataReader",
     label="Waveform Data Reader",
-    extensions="h5",
-    file_description="HDF5 files",
+    extensions="h5 npz",
+    file_description="Waveform files",
 )
 class WaveformDataReader(VTKPythonAlgorithmBase):
     """Read waveform data from an HDF5 file.
 
-    This plugin currently assumes the data in the 'Subfile' is stored in the
+    By default, this plugin assumes the data in the 'Subfile' is stored in the
     SpEC waveform file format. It is documented in Appendix A.3.1 in the 2019
     SXS catalog paper (https://arxiv.org/abs/1904.04831). Specifically:
 
@@ -44,6 +49,29 @@ class WaveformDataReader(VTKPythonAlgorithmBase):
 
       The 'Time' column should be the same for all datasets. It will only be
       read from the (2,2) mode dataset.
+
+    The reader also supports formats that can be read faster, see
+    `gwpv.waveform_formats` for details:
+
+    - HDF5 files where the 'Subfile' holds all modes in one contiguous 'data'
+      dataset alongside a 'time' dataset, like `scri` and `sxs` waveforms.
+    - NumPy '.npz' files, or directories of '.npy' files that are
+      memory-mapped, with a 'Time' array and one array per mode named like
+      'Y_l2_m2'. The 'Subfile' is ignored for these.
+
+    Only the modes enabled in the 'Modes' selection and with l <= 'EllMax' are
+    read, so set these to the modes that downstream filters need to save time
+    and memory. An 'EllMax' of 0 reads modes with any l.
+
+    Set the 'TimeRange' to read only the part of the data that is needed to
+    interpolate anywhere within this range. The default range of (0, 0) reads
+    all data. Set the 'TimeRangeStride' to the 'KeepEveryNthTimestep' of
+    downstream `WaveformToVolume` filters so they keep the same samples as
+    without the 'TimeRange'.
+
+    Enable 'ResampleUniform' to resample all modes onto uniformly spaced times
+    once when the data is loaded. Downstream filters like `WaveformToVolume`
+    can interpolate uniformly sampled data much faster.
     """
 
     WAVEFORM_MODES_KEY = vtkkeys.MakeKey(
@@ -56,11 +84,21 @@ class WaveformDataReader(VTKPythonAlgorithmBase):
         )
         self._filename = None
         self._subfile = None
+        self._resample_uniform = False
+        self._resample_timestep = 0.0
+        self._resample_order = 1
+        self._ell_max = 0
+        self._time_range = (0.0, 0.0)
+        self._time_range_stride = 1
         self.mode_names = []
+        self.modes_selection = vtkDataArraySelection()
+        self.modes_selection.AddObserver(
+            "ModifiedEvent", das_util.create_modified_callback(self)
+        )
 
     @smproperty.stringvector(name="FileName")
     @smdomain.filelist()
-    @smhint.filechooser(extensions="h5", file_description="HDF5 files")
+    @smhint.filechooser(extensions="h5 npz", file_description="Waveform files")
     def SetFileName(self, value):
         self._filename = value
         self.Modified()
@@ -72,6 +110,60 @@ class WaveformDataReader(VTKPythonAlgorithmBase):
         self._subfile = value
         self.Modified()
 
+    @smproperty.dataarrayselection(name="Modes")
+    def GetModes(self):
+        return self.modes_selection
+
+    @smproperty.intvector(name="EllMax", default_values=0)
+    def SetEllMax(self, value):
+        self._ell_max = value
+        self.Modified()
+
+    @smproperty.doublevector(name="TimeRange", default_values=[0.0, 0.0])
+    def SetTimeRange(self, start, stop):
+        self._time_range = (start, stop)
+        self.Modified()
+
+    @smproperty.intvector(name="TimeRangeStride", default_values=1)
+    def SetTimeRangeStride(self, value):
+        self._time_range_stride = value
+        self.Modified()
+
+    def _get_selected_mode_names(self):
+        return [
+            mode_name
+            for mode_name in self.mode_names
+            if self.modes_selection.ArrayIsEnabled(mode_name)
+            and (
+                self._ell_max <= 0
+                or waveform_data.parse_mode_name(mode_name)[0] <= self._ell_max
+            )
+        ]
+
+    @smproperty.intvector(name="ResampleUniform", default_values=False)
+    @smdomain.xml('<BooleanDomain name="bool"/>')
+    def SetResampleUniform(self, value):
+        self._resample_uniform = value
+        self.Modified()
+
+    # Spacing of the uniformly resampled times. Set to 0 to use the smallest
+    # spacing in the data.
+    @smproperty.doublevector(name="ResampleTimestep", default_values=0)
+    def SetResampleTimestep(self, value):
+        self._resample_timestep = value
+        self.Modified()
+
+    @smproperty.intvector(name="ResampleInterpolationOrder", default_values=1)
+    @smdomain.xml(
+        '<EnumerationDomain name="enum">'
+        '<Entry value="1" text="Linear"/>'
+        '<Entry value="3" text="Cubic"/>'
+        "</EnumerationDomain>"
+    )
+    def SetResampleInterpolationOrder(self, value):
+        self._resample_order = value
+        self.Modified()
+
     def RequestInformation(self, request, inInfo, outInfo):
         logger.debug("Requesting information...")
         info = outInfo.GetInformationObject(0)
@@ -79,21 +171,18 @@ class WaveformDataReader(VTKPythonAlgorithmBase):
         # propagates down the pipeline. This allows subsequent filters to select
         # a subset of modes to display, for example.
         if self._filename is not None and self._subfile is not None:
-            with h5py.File(self._filename, "r") as f:
-                self.mode_names = list(
-                    map(
-                        lambda dataset_name: dataset_name.replace(".dat", ""),
-                        filter(
-                            lambda dataset_name: dataset_name.startswith("Y_"),
-                            f[self._subfile].keys(),
-                        ),
-                    )
-                )
+            # Only list the modes here. Scanning the data for metadata would
+            # read all modes in full.
+            self.mode_names = open_waveform_file(
+                self._filename, self._subfile
+            ).mode_names
             if len(self.mode_names) == 0:
                 logger.warning(
                     "No waveform mode datasets (prefixed 'Y_') found in file"
                     f" '{self._filename}:{self._subfile}'."
                 )
+            for mode_name in self.mode_names:
+                self.modes_selection.AddArray(mode_name)
             logger.debug("Set MODE_ARRAYS: {}".format(self.mode_names))
             info.Remove(WaveformDataReader.WAVEFORM_MODES_KEY)
             for mode_name in self.mode_names:
@@ -118,20 +207,44 @@ class WaveformDataReader(VTKPythonAlgorithmBase):
             and self._subfile is not None
             and len(self.mode_names) > 0
         ):
-            with h5py.File(self._filename, "r") as f:
-                strain = f[self._subfile]
-                t = strain["Y_l2_m2.dat"][:, 0]
-                col_time = vtknp.numpy_to_vtk(t, deep=False)
-                col_time.SetName("Time")
-                output.AddColumn(col_time)
-
-                for mode_name in self.mode_names:
-                    logger.debug(f"Reading mode '{mode_name}'...")
-                    col_mode = vtknp.numpy_to_vtk(
-                        strain[mode_name + ".dat"][:, 1:], deep=False
-                    )
-                    col_mode.SetName(mode_name)
-                    output.AddColumn(col_mode)
+            waveform_file = open_waveform_file(self._filename, self._subfile)
+            mode_names = self._get_selected_mode_names()
+            logger.debug(
+                f"Reading modes {mode_names} with"
+                f" {type(waveform_file).__name__}..."
+            )
+            t, modes = waveform_file.read(
+                mode_names,
+                time_range=(
+                    self._time_range
+                    if self._time_range[0] < self._time_range[1]
+                    else None
+                ),
+                time_stride=self._time_range_stride,
+            )
+            logger.debug(f"Read {len(t)} samples.")
+
+            if self._resample_uniform:
+                t, modes = waveform_data.resample_uniform(
+                    t,
+                    modes,
+                    dt=self._resample_timestep,
+                    order=self._resample_order,
+                )
+                logger.debug(
+                    f"Resampled waveform data uniformly to {len(t)} times with"
+                    f" dt={t[1] - t[0]:.2e}."
+                )
+
+            col_time = vtknp.numpy_to_vtk(t, deep=False)
+            col_time.SetName("Time")
+            output.AddColumn(col_time)
+            for mode_name, mode_data in modes.items():
+                col_mode = vtknp.numpy_to_vtk(
+                    np.ascontiguousarray(mode_data), deep=False
+                )
+                col_mode.SetName(mode_name)
+                output.AddColumn(col_mode)
 
         logger.info(f"Waveform data loaded in {time.time() - start_time:.3f}s.")
 
@@ -5,7 +5,9 @@
 # from WaveformDataReader import WaveformDataReader
 
 import logging
+import os
 import time
+from collections import namedtuple
 
 import numpy as np
 from paraview import util
@@ -18,7 +20,8 @@ from vtkmodules.vtkCommonDataModel import vtkUniformGrid
 
 import gwpv.plugin_util.data_array_selection as das_util
 import gwpv.plugin_util.timesteps as timesteps_util
-from gwpv import swsh_cache
+from gwpv import strain_volume, swsh_cache, volume_cache
+from gwpv.waveform_data import time_window
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +54,8 @@ def deactivation(x, width, outer):
 # to trigger a "ModifiedEvent" so the data is recomputed.
 _cached_swsh_grid = None
 _cached_r = None
+_cached_radial_weight = None
+_cached_screened_points = None
 _cached_grid_id = None
 
 
@@ -63,7 +68,20 @@ def cached_swsh_grid(
     add_one_over_r_scaling,
     **swsh_grid_kwargs,
 ):
-    global _cached_swsh_grid, _cached_r, _cached_grid_id
+    """Retrieve the SWSH grid, the radial coordinate and the radial weight
+
+    The radial weight combines the screening and the optional 1/r scaling. It
+    is returned separately instead of being multiplied into the SWSH grid so
+    the grid can stay a read-only memory map of the cache file. The radial
+    coordinate and weight have the real dtype that corresponds to the complex
+    `dtype` of the SWSH grid.
+
+    Also returns the sorted indices of the grid points where the radial weight
+    is nonzero. The strain vanishes at all other points, e.g. in the screened
+    core and in the corners outside the `size`.
+    """
+    global _cached_swsh_grid, _cached_r, _cached_radial_weight
+    global _cached_screened_points, _cached_grid_id
     grid_id = dict(
         size=size,
         radial_scale=radial_scale,
@@ -75,26 +93,115 @@ def cached_swsh_grid(
     grid_id.update(swsh_grid_kwargs)
     if _cached_grid_id == grid_id:
         logger.debug("Using cached SWSHs grid from memory.")
-        return _cached_swsh_grid, _cached_r
+        return (
+            _cached_swsh_grid,
+            _cached_r,
+            _cached_radial_weight,
+            _cached_screened_points,
+        )
     else:
         logger.debug("No SWSH grid in memory, retrieving from disk cache.")
         swsh_grid, r = swsh_cache.cached_swsh_grid(
             size=size, **swsh_grid_kwargs
         )
         # Apply screening
-        screen = activation(
+        radial_weight = activation(
             r - activation_offset, activation_width
         ) * deactivation(r, deactivation_width, size)
-        swsh_grid *= screen.reshape(screen.shape + (1,))
         # Apply radial scale
         r *= radial_scale
         if add_one_over_r_scaling:
-            swsh_grid /= (r + 1.0e-30).reshape(r.shape + (1,))
+            radial_weight /= r + 1.0e-30
+        real_dtype = np.finfo(swsh_grid.dtype).dtype
+        r = r.astype(real_dtype, copy=False)
+        radial_weight = radial_weight.astype(real_dtype, copy=False)
+        screened_points = np.flatnonzero(radial_weight).astype(
+            np.int32 if len(r) < 2**31 else np.int64
+        )
+        logger.debug(
+            f"Radial weight is nonzero at {len(screened_points)} of {len(r)}"
+            " grid points."
+        )
         # Cache and return
         _cached_swsh_grid = swsh_grid
         _cached_r = r
+        _cached_radial_weight = radial_weight
+        _cached_screened_points = screened_points
         _cached_grid_id = grid_id
-        return swsh_grid, r
+        return swsh_grid, r, radial_weight, screened_points
+
+
+_cached_radial_shells = None
+_cached_radial_shells_id = None
+
+
+def cached_radial_shells(**radial_shells_kwargs):
+    global _cached_radial_shells, _cached_radial_shells_id
+    if _cached_radial_shells_id == radial_shells_kwargs:
+        logger.debug("Using cached radial shells from memory.")
+        return _cached_radial_shells
+    logger.debug("No radial shells in memory, retrieving from disk cache.")
+    _cached_radial_shells = swsh_cache.cached_radial_shells(
+        **radial_shells_kwargs
+    )
+    _cached_radial_shells_id = radial_shells_kwargs
+    return _cached_radial_shells
+
+
+def add_volume_data(output, volume_data):
+    for name, data in volume_data.items():
+        data_vtk = vtknp.numpy_to_vtk(data, deep=True)
+        data_vtk.SetName(name)
+        output.GetPointData().AddArray(data_vtk)
+
+
+# The waveform modes that `WaveformToVolume` interpolates, prepared once per
+# input: the (restricted) `times` and the complex `modes` with shape
+# (num_times, num_modes), the SWSH index of each mode, the names and start
+# indices of the (l, |m|) mode groups, and whether the times are sampled
+# uniformly with spacing `dt`. Non-uniform times come with a `search_table`
+# (see `strain_volume.search_table`). The `mode_derivatives` are only set for
+# cubic interpolation.
+PreprocessedWaveform = namedtuple(
+    "PreprocessedWaveform",
+    [
+        "times",
+        "modes",
+        "swsh_indices",
+        "mode_names",
+        "mode_offsets",
+        "uniformly_sampled",
+        "dt",
+        "search_table",
+        "mode_derivatives",
+    ],
+)
+
+_cached_waveform = None
+_cached_waveform_id = None
+
+# Largest number of values (frames times grid points) that `fill_volume_cache`
+# computes at once
+MAX_BATCH_VOLUME_SIZE = 2**26
+
+_cached_waveform_digest = None
+_cached_waveform_digest_id = None
+
+
+def cached_waveform_digest(waveform_data):
+    # Hashing the waveform data takes a moment, so only do it when the input
+    # has changed
+    global _cached_waveform_digest, _cached_waveform_digest_id
+    waveform_digest_id = waveform_data.VTKObject.GetMTime()
+    if _cached_waveform_digest_id != waveform_digest_id:
+        _cached_waveform_digest = volume_cache.waveform_digest(
+            {
+                name: waveform_data.RowData[name]
+                for name in waveform_data.RowData.keys()
+            }
+        )
+        _cached_waveform_digest_id = waveform_digest_id
+    return _cached_waveform_digest
 
 
 has_shown_warning_nonuniformly_sampled = False
@@ -171,6 +278,20 @@ class WaveformToVolume(VTKPythonAlgorithmBase):
         self.normalize_each_mode = value
         self.Modified()
 
+    # Interpolate the waveform modes in time linearly or with cubic Hermite
+    # polynomials. Cubic interpolation allows keeping fewer timesteps (see
+    # `KeepEveryNthTimestep`) without visible artifacts.
+    @smproperty.intvector(name="InterpolationOrder", default_values=1)
+    @smdomain.xml(
+        '<EnumerationDomain name="enum">'
+        '<Entry value="1" text="Linear"/>'
+        '<Entry value="3" text="Cubic"/>'
+        "</EnumerationDomain>"
+    )
+    def SetInterpolationOrder(self, value):
+        self.interpolation_order = value
+        self.Modified()
+
     @smproperty.dataarrayselection(name="Polarizations")
     def GetPolarizations(self):
         return self.polarizations_selection
@@ -187,6 +308,42 @@ class WaveformToVolume(VTKPythonAlgorithmBase):
         self.num_points_per_dim = value
         self.Modified()
 
+    # Compute the volume data in single or double precision. Single precision
+    # halves memory and per-frame compute time without visible differences.
+    @smproperty.intvector(name="Precision", default_values=64)
+    @smdomain.xml(
+        '<EnumerationDomain name="enum">'
+        '<Entry value="32" text="Single"/>'
+        '<Entry value="64" text="Double"/>'
+        "</EnumerationDomain>"
+    )
+    def SetPrecision(self, value):
+        self.precision = value
+        self.Modified()
+
+    # Compute the volume data only at points that the waveform has reached and
+    # not yet passed through. The strain is zero at all other points.
+    @smproperty.intvector(name="SkipInactivePoints", default_values=False)
+    @smdomain.xml('<BooleanDomain name="bool"/>')
+    def SetSkipInactivePoints(self, value):
+        self.skip_inactive_points = value
+        self.Modified()
+
+    # Compute the volume data only at points where the screening (see
+    # `ActivationOffset`, `ActivationWidth` and `DeactivationWidth`) doesn't
+    # vanish. The strain is zero at all other points.
+    @smproperty.intvector(name="SkipScreenedPoints", default_values=False)
+    @smdomain.xml('<BooleanDomain name="bool"/>')
+    def SetSkipScreenedPoints(self, value):
+        self.skip_screened_points = value
+        self.Modified()
+
+    # Compute the volume data for slabs of the grid in parallel threads
+    @smproperty.intvector(name="NumberOfThreads", default_values=1)
+    def SetNumberOfThreads(self, value):
+        self.num_threads = value
+        self.Modified()
+
     @smproperty.intvector(name="KeepEveryNthTimestep", default_values=1)
     def SetKeepEveryNthTimestep(self, value):
         self.keep_every_n_timestep = value
@@ -252,6 +409,47 @@ class WaveformToVolume(VTKPythonAlgorithmBase):
         self.swsh_cache_dir = value
         self.Modified()
 
+    # Open the cached SWSH grid as a read-only memory map so that all render
+    # processes on a node share one copy in the page cache
+    @smproperty.intvector(name="SwshCacheMemoryMap", default_values=False)
+    @smdomain.xml('<BooleanDomain name="bool"/>')
+    def SetSwshCacheMemoryMap(self, value):
+        self.swsh_cache_mmap = value
+        self.Modified()
+
+    # Compute and cache the SWSHs only on the z <= 0 half of the grid and
+    # rebuild the other half by reflection
+    @smproperty.intvector(
+        name="SwshCacheReflectionSymmetry", default_values=False
+    )
+    @smdomain.xml('<BooleanDomain name="bool"/>')
+    def SetSwshCacheReflectionSymmetry(self, value):
+        self.swsh_cache_reflection_symmetry = value
+        self.Modified()
+
+    # Interpolate the waveform once per radial shell of this width (in units of
+    # the grid spacing) instead of once per grid point. Set to 0 to disable.
+    @smproperty.doublevector(name="RadialShellWidth", default_values=0)
+    def SetRadialShellWidth(self, value):
+        self.radial_shell_width = value
+        self.Modified()
+
+    # Interpolate the SWSHs from a (theta, phi) table with this many points in
+    # theta instead of storing them for every grid point. Set to 0 to use the
+    # dense grid.
+    @smproperty.intvector(name="SwshAngularResolution", default_values=0)
+    def SetSwshAngularResolution(self, value):
+        self.swsh_angular_resolution = value
+        self.Modified()
+
+    # Cache the volume data of every frame in this directory and load it from
+    # there when the same frame is requested again, e.g. when re-rendering a
+    # scene with a different look. Leave empty to disable.
+    @smproperty.stringvector(name="VolumeCacheDirectory", default_values="")
+    def SetVolumeCacheDirectory(self, value):
+        self.volume_cache_dir = value
+        self.Modified()
+
     def _get_timesteps(self):
         logger.debug("Getting time range from data...")
         waveform_data = self._get_waveform_data()
@@ -296,36 +494,14 @@ class WaveformToVolume(VTKPythonAlgorithmBase):
         # logger.debug("Information object: {}".format(info))
         return 1
 
-    def RequestData(self, request, inInfo, outInfo):
-        logger.debug("Requesting data...")
-        waveform_data = self._get_waveform_data()
-        # grid_data = self._get_grid_data()
-        output = dsa.WrapDataObject(vtkUniformGrid.GetData(outInfo))
-
-        t = timesteps_util.get_timestep(self, logger=logger)
-        N = self.num_points_per_dim
-        D = self.size
-
-        # We may have to forward the grid data here when using SwshGrid input
-        # output.SetDimensions(*grid_data.GetDimensions())
-        # output.SetOrigin(*grid_data.GetOrigin())
-        # output.SetSpacing(*grid_data.GetSpacing())
-        dx = 2.0 * D / N
-        N_y = N // 2 if self.clip_y_normal else N
-        N_z = N // 2 if self.clip_z_normal else N
-        output.SetDimensions(N, N_y, N_z)
-        output.SetOrigin(-D, -D, -D)
-        output.SetSpacing(dx, dx, dx)
-
+    def _get_swsh_grid(self):
         # Compute the SWSHs on the grid
         # This section can be deleted when using SwshGrid input
-        spin_weight = -2
-        ell_max = self.ell_max
-        swsh_grid, r = cached_swsh_grid(
-            size=D,
-            num_points=N,
+        return cached_swsh_grid(
+            size=self.size,
+            num_points=self.num_points_per_dim,
             spin_weight=self.spin_weight,
-            ell_max=ell_max,
+            ell_max=self.ell_max,
             radial_scale=self.radial_scale,
             clip_y_normal=self.clip_y_normal,
             clip_z_normal=self.clip_z_normal,
@@ -334,14 +510,61 @@ class WaveformToVolume(VTKPythonAlgorithmBase):
             deactivation_width=self.deactivation_width,
             add_one_over_r_scaling=self.add_one_over_r_scaling,
             cache_dir=self.swsh_cache_dir,
+            mmap=self.swsh_cache_mmap,
+            reflection_symmetry=self.swsh_cache_reflection_symmetry,
+            angular_resolution=self.swsh_angular_resolution,
+            dtype=swsh_cache.complex_dtype(self.precision),
         )
 
-        logger.info(f"Computing volume data at t={t}...")
-        start_time = time.time()
-
-        # Compute scaled waveform phase on the grid
+    def _get_retarded_time(self, r):
+        # Compute the time offset of the scaled waveform phase on the grid, so
+        # the phase at time `t` is `t - retarded_time`. Also returns the index
+        # of the radial shell of each grid point if the retarded time is
+        # computed per shell.
         # r = vtknp.vtk_to_numpy(grid_data.GetPointData()['RadialCoordinate'])
-        phase = t - r + self.activation_offset * self.radial_scale
+        if self.radial_shell_width > 0:
+            # The phase depends only on the radius, so evaluate it per shell
+            shell_radii, shell_index = cached_radial_shells(
+                size=self.size,
+                num_points=self.num_points_per_dim,
+                clip_y_normal=self.clip_y_normal,
+                clip_z_normal=self.clip_z_normal,
+                shell_width=self.radial_shell_width,
+                cache_dir=self.swsh_cache_dir,
+            )
+            r_phase = (shell_radii * self.radial_scale).astype(r.dtype)
+        else:
+            shell_index = None
+            r_phase = r
+        return r_phase - self.activation_offset * self.radial_scale, shell_index
+
+    def _get_waveform_modes(self, waveform_data, dtype):
+        # Preparing the waveform modes touches the full waveform data, so only
+        # do it when the input or the relevant properties have changed
+        global _cached_waveform, _cached_waveform_id
+        waveform_id = dict(
+            input_mtime=waveform_data.VTKObject.GetMTime(),
+            ell_max=self.ell_max,
+            modes=das_util.get_enabled_arrays(self.modes_selection),
+            keep_every_n_timestep=self.keep_every_n_timestep,
+            invert_rotation_direction=self.invert_rotation_direction,
+            normalize_each_mode=self.normalize_each_mode,
+            interpolation_order=self.interpolation_order,
+            dtype=np.dtype(dtype).name,
+        )
+        if _cached_waveform_id == waveform_id:
+            logger.debug("Using preprocessed waveform from memory.")
+            return _cached_waveform
+        logger.debug("Preprocessing waveform...")
+        _cached_waveform = self._preprocess_waveform(waveform_data, dtype)
+        _cached_waveform_id = waveform_id
+        return _cached_waveform
+
+    def _preprocess_waveform(self, waveform_data, dtype):
+        # Collect the waveform data and SWSH indices of all selected modes so
+        # the strain can be computed in one pass over the grid
+        spin_weight = -2
+        ell_max = self.ell_max
 
         # Invert rotation direction
         rotation_direction = -1.0 if self.invert_rotation_direction else 1.0
@@ -349,65 +572,21 @@ class WaveformToVolume(VTKPythonAlgorithmBase):
         # Compute strain in the volume from the input waveform data
         skip_timesteps = self.keep_every_n_timestep
         waveform_timesteps = waveform_data.RowData["Time"][::skip_timesteps]
-        strain = np.zeros(len(r), dtype=np.complex)
-        # Optimization for when the waveform is sampled uniformly
-        # TODO: Cache this
-        dt = np.diff(waveform_timesteps)
-        waveform_uniformly_sampled = np.allclose(dt, dt[0])
-        global has_shown_warning_nonuniformly_sampled
-        if waveform_uniformly_sampled:
-            dt = dt[0]
-            logger.debug(
-                f"Waveform sampled uniformly with dt={dt:.2e}, using optimized"
-                " interpolation:"
-            )
-            waveform_start_time = waveform_timesteps[0]
-            waveform_start_index = min(
-                len(waveform_timesteps) - 2,
-                max(
-                    0, int(np.floor((np.min(phase) - waveform_start_time) / dt))
-                ),
-            )
-            waveform_stop_index = max(
-                waveform_start_index + 1,
-                min(
-                    len(waveform_timesteps),
-                    int(np.ceil((np.max(phase) - waveform_start_time) / dt)),
-                ),
-            )
-            if waveform_stop_index == len(waveform_timesteps):
-                waveform_stop_index = -1
-            logger.debug(
-                "Restricting interpolation to waveform indices"
-                f" ({waveform_start_index}, {waveform_stop_index}), that's"
-                " between waveform times"
-                f" ({waveform_timesteps[waveform_start_index]},"
-                f" {waveform_timesteps[waveform_stop_index]}). We will"
-                f" interpolate to times between ({np.min(phase)},"
-                f" {np.max(phase)}) (should be contained in restricted waveform"
-                " range except for boundary effects)."
-            )
-            waveform_timesteps = waveform_timesteps[
-                waveform_start_index:waveform_stop_index
-            ]
-        elif not has_shown_warning_nonuniformly_sampled:
-            logger.warning(
-                "Waveform is not sampled uniformly so interpolation is slightly"
-                " more expensive."
-            )
-            has_shown_warning_nonuniformly_sampled = True
         # for i in range(self.modes_selection.GetNumberOfArrays()):
         #     mode_name = self.modes_selection.GetArrayName(i)
+        waveform_modes = []
+        swsh_indices = []
+        mode_names = []
+        mode_offsets = []
         for l in range(abs(spin_weight), ell_max + 1):
             for abs_m in range(0, l + 1):
                 mode_name = get_mode_name(l, abs_m)
-                strain_mode = np.zeros(len(r), dtype=np.complex)
                 if not self.modes_selection.ArrayIsEnabled(mode_name):
                     continue
+                mode_offset = len(waveform_modes)
                 for sign_m in (-1, 1):
                     m = abs_m * sign_m
                     dataset_name = "Y_l{}_m{}".format(l, m)
-                    mode_profile = swsh_grid[:, LM_index(l, m, 0)]
                     # mode_profile = vtknp.vtk_to_numpy(grid_data.GetPointData()[dataset_name])
                     waveform_mode_data = waveform_data.RowData[dataset_name][
                         ::skip_timesteps
@@ -426,41 +605,346 @@ class WaveformToVolume(VTKPythonAlgorithmBase):
                     )
                     if self.normalize_each_mode:
                         waveform_mode_data /= np.max(np.abs(waveform_mode_data))
-                    if waveform_uniformly_sampled:
-                        waveform_mode_data = waveform_mode_data[
-                            waveform_start_index:waveform_stop_index
-                        ]
-                    mode_data = np.interp(
-                        phase,
-                        waveform_timesteps,
-                        waveform_mode_data,
-                        left=0.0,
-                        right=0.0,
-                    )
-                    strain_mode += mode_data * mode_profile
-                strain += strain_mode
-                # Expose individual modes in output
-                if self.store_individual_modes:
-                    if self.polarizations_selection.ArrayIsEnabled("Plus"):
-                        strain_mode_real_vtk = vtknp.numpy_to_vtk(
-                            np.real(strain_mode), deep=True
-                        )
-                        strain_mode_real_vtk.SetName(mode_name + " Plus")
-                        output.GetPointData().AddArray(strain_mode_real_vtk)
-                    if self.polarizations_selection.ArrayIsEnabled("Cross"):
-                        strain_mode_imag_vtk = vtknp.numpy_to_vtk(
-                            np.imag(strain_mode), deep=True
-                        )
-                        strain_mode_imag_vtk.SetName(mode_name + " Cross")
-                        output.GetPointData().AddArray(strain_mode_imag_vtk)
+                    waveform_modes.append(waveform_mode_data)
+                    swsh_indices.append(LM_index(l, m, 0))
+                if len(waveform_modes) > mode_offset:
+                    mode_names.append(mode_name)
+                    mode_offsets.append(mode_offset)
+        waveform_modes = np.ascontiguousarray(
+            np.array(waveform_modes, dtype=dtype)
+            .reshape(len(swsh_indices), len(waveform_timesteps))
+            .T
+        )
+        # Detect if the waveform is sampled uniformly, which allows restricting
+        # it to the time window that is needed for a frame
+        waveform_timesteps = np.array(waveform_timesteps, dtype=float)
+        dt = np.diff(waveform_timesteps)
+        waveform_uniformly_sampled = bool(np.allclose(dt, dt[0]))
+        return PreprocessedWaveform(
+            times=waveform_timesteps,
+            modes=waveform_modes,
+            swsh_indices=np.array(swsh_indices, dtype=int),
+            mode_names=mode_names,
+            mode_offsets=mode_offsets,
+            uniformly_sampled=waveform_uniformly_sampled,
+            dt=dt[0] if waveform_uniformly_sampled else None,
+            search_table=(
+                None
+                if waveform_uniformly_sampled
+                else strain_volume.search_table(waveform_timesteps)
+            ),
+            mode_derivatives=(
+                strain_volume.mode_derivatives(
+                    waveform_timesteps, waveform_modes
+                )
+                if self.interpolation_order == 3
+                else None
+            ),
+        )
+
+    def _restrict_waveform(self, waveform, min_phase, max_phase):
+        # Optimization for when the waveform is sampled uniformly: restrict
+        # the waveform data to the time window between `min_phase` and
+        # `max_phase`. Returns the restricted `PreprocessedWaveform`.
+        waveform_timesteps = waveform.times
+        global has_shown_warning_nonuniformly_sampled
+        if waveform.uniformly_sampled:
+            dt = waveform.dt
+            logger.debug(
+                f"Waveform sampled uniformly with dt={dt:.2e}, using optimized"
+                " interpolation:"
+            )
+            # Keep the samples just outside the phase range, so phases on the
+            # edge of the window interpolate the same as with the full data
+            window = time_window(waveform_timesteps, min_phase, max_phase)
+            # Interpolation needs at least two samples, also when all phases
+            # lie outside the waveform data
+            window_start = min(window.start, len(waveform_timesteps) - 2)
+            window = slice(window_start, max(window.stop, window_start + 2))
+            logger.debug(
+                "Restricting interpolation to waveform indices"
+                f" ({window.start}, {window.stop}), that's between waveform"
+                f" times ({waveform_timesteps[window.start]},"
+                f" {waveform_timesteps[window.stop - 1]}). We will"
+                f" interpolate to times between ({min_phase},"
+                f" {max_phase})."
+            )
+            return waveform._replace(
+                times=waveform_timesteps[window],
+                modes=waveform.modes[window],
+                mode_derivatives=(
+                    waveform.mode_derivatives[window]
+                    if waveform.mode_derivatives is not None
+                    else None
+                ),
+            )
+        elif not has_shown_warning_nonuniformly_sampled:
+            logger.warning(
+                "Waveform is not sampled uniformly so interpolation is slightly"
+                " more expensive."
+            )
+            has_shown_warning_nonuniformly_sampled = True
+        return waveform
+
+    def _get_points(
+        self,
+        min_phase,
+        max_phase,
+        waveform_timesteps,
+        shell_index,
+        screened_points,
+    ):
+        # Select the grid points at which the strain is computed, or `None` for
+        # all points. The phase at each grid point (or radial shell) ranges
+        # between `min_phase` and `max_phase`.
+        # Only compute the strain where it can be nonzero
+        points = screened_points if self.skip_screened_points else None
+        # Only points whose retarded time lies within the waveform data carry a
+        # signal. The strain at all other points is zero, so we can skip them.
+        if self.skip_inactive_points:
+            active = (max_phase >= waveform_timesteps[0]) & (
+                min_phase <= waveform_timesteps[-1]
+            )
+            if shell_index is not None:
+                active = active[shell_index]
+            if points is None:
+                points = np.flatnonzero(active)
+            else:
+                points = points[active[points]]
+        return points
+
+    def compute_volume_data(self, times, output_file=None):
+        """Compute the volume data at a batch of times in one call
+
+        Evaluates the strain that `RequestData` computes for a single frame at
+        all `times`, e.g. the frame times of a `frame_window`. The SWSH grid,
+        the waveform modes and the selection of grid points are set up only
+        once for all times, and the SWSHs are contracted with the waveform
+        modes at all times at once. The filter's input must be up to date, e.g.
+        by calling `UpdatePipeline` on the proxy first.
+
+        Arguments:
+          times: The times at which to compute the volume data.
+          output_file: Optional path to an '.npy' file. If specified, the
+            volume data is written to this file and returned as a memory map.
+
+        Returns: The complex strain with shape (len(times), num_points). Its
+          real part is the "Plus strain" and its imaginary part is the "Cross
+          strain" that `RequestData` outputs.
+        """
+        times = np.asarray(times, dtype=float)
+        logger.info(f"Computing volume data at {len(times)} times...")
+        start_time = time.time()
+        swsh_grid, r, radial_weight, screened_points = self._get_swsh_grid()
+        retarded_time, shell_index = self._get_retarded_time(r)
+        waveform = self._get_waveform_modes(
+            self._get_waveform_data(), dtype=swsh_grid.dtype
+        )
+        waveform = self._restrict_waveform(
+            waveform,
+            min_phase=np.min(times) - np.max(retarded_time),
+            max_phase=np.max(times) - np.min(retarded_time),
+        )
+        points = self._get_points(
+            min_phase=np.min(times) - retarded_time,
+            max_phase=np.max(times) - retarded_time,
+            waveform_timesteps=waveform.times,
+            shell_index=shell_index,
+            screened_points=screened_points,
+        )
+        out = None
+        if output_file is not None:
+            out = np.lib.format.open_memmap(
+                output_file,
+                mode="w+",
+                dtype=swsh_grid.dtype,
+                shape=(len(times), len(r)),
+            )
+        strain = strain_volume.compute_strain_batch(
+            times,
+            retarded_time,
+            waveform_times=waveform.times,
+            waveform_modes=waveform.modes,
+            dt=waveform.dt,
+            search_table=waveform.search_table,
+            waveform_mode_derivatives=waveform.mode_derivatives,
+            swsh_grid=swsh_grid,
+            swsh_indices=waveform.swsh_indices,
+            radial_weight=radial_weight,
+            shell_index=shell_index,
+            points=points,
+            num_threads=self.num_threads,
+            out=out,
+        )
+        if output_file is not None:
+            strain.flush()
+        logger.info(f"Volume data computed in {time.time() - start_time:.3f}s.")
+        return strain
+
+    def fill_volume_cache(self, times):
+        """Compute the volume data at a batch of times and cache it
+
+        Computes the volume data at all `times` that aren't cached yet in the
+        'VolumeCacheDirectory' with `compute_volume_data` and caches it, so
+        `RequestData` only loads it from the cache. Does nothing if the volume
+        cache is disabled or individual modes are stored, which
+        `compute_volume_data` doesn't compute. The filter's input must be up to
+        date, e.g. by calling `UpdatePipeline` on the proxy first.
+        """
+        if not self.volume_cache_dir or self.store_individual_modes:
+            return
+        waveform_data = self._get_waveform_data()
+        frame_ids = [self._get_volume_frame_id(waveform_data, t) for t in times]
+        missing = [
+            (t, frame_id)
+            for t, frame_id in zip(times, frame_ids)
+            if not os.path.exists(
+                volume_cache.volume_frame_file(self.volume_cache_dir, frame_id)
+            )
+        ]
+        if len(missing) == 0:
+            return
+        # Bound the memory that a batch of volume data takes
+        N = self.num_points_per_dim
+        N_y = N // 2 if self.clip_y_normal else N
+        N_z = N // 2 if self.clip_z_normal else N
+        batch_size = max(1, MAX_BATCH_VOLUME_SIZE // (N * N_y * N_z))
+        for batch_start in range(0, len(missing), batch_size):
+            batch = missing[batch_start : batch_start + batch_size]
+            strain = self.compute_volume_data([t for t, _ in batch])
+            for (_, frame_id), frame_strain in zip(batch, strain):
+                volume_data = {}
+                if self.polarizations_selection.ArrayIsEnabled("Plus"):
+                    volume_data["Plus strain"] = np.real(frame_strain)
+                if self.polarizations_selection.ArrayIsEnabled("Cross"):
+                    volume_data["Cross strain"] = np.imag(frame_strain)
+                volume_cache.save_volume_frame(
+                    self.volume_cache_dir, frame_id, volume_data
+                )
+
+    def _get_volume_frame_id(self, waveform_data, t):
+        # Everything the volume data at time `t` depends on
+        return dict(
+            waveform=cached_waveform_digest(waveform_data),
+            time=float(t),
+            size=self.size,
+            num_points=self.num_points_per_dim,
+            spin_weight=self.spin_weight,
+            ell_max=self.ell_max,
+            radial_scale=self.radial_scale,
+            clip_y_normal=self.clip_y_normal,
+            clip_z_normal=self.clip_z_normal,
+            add_one_over_r_scaling=self.add_one_over_r_scaling,
+            invert_rotation_direction=self.invert_rotation_direction,
+            activation_offset=self.activation_offset,
+            activation_width=self.activation_width,
+            deactivation_width=self.deactivation_width,
+            keep_every_n_timestep=self.keep_every_n_timestep,
+            normalize_each_mode=self.normalize_each_mode,
+            interpolation_order=self.interpolation_order,
+            store_individual_modes=self.store_individual_modes,
+            precision=self.precision,
+            radial_shell_width=self.radial_shell_width,
+            swsh_angular_resolution=self.swsh_angular_resolution,
+            modes=das_util.get_enabled_arrays(self.modes_selection),
+            polarizations=das_util.get_enabled_arrays(
+                self.polarizations_selection
+            ),
+        )
+
+    def RequestData(self, request, inInfo, outInfo):
+        logger.debug("Requesting data...")
+        waveform_data = self._get_waveform_data()
+        # grid_data = self._get_grid_data()
+        output = dsa.WrapDataObject(vtkUniformGrid.GetData(outInfo))
+
+        t = timesteps_util.get_timestep(self, logger=logger)
+        N = self.num_points_per_dim
+        D = self.size
+
+        # We may have to forward the grid data here when using SwshGrid input
+        # output.SetDimensions(*grid_data.GetDimensions())
+        # output.SetOrigin(*grid_data.GetOrigin())
+        # output.SetSpacing(*grid_data.GetSpacing())
+        dx = 2.0 * D / N
+        N_y = N // 2 if self.clip_y_normal else N
+        N_z = N // 2 if self.clip_z_normal else N
+        output.SetDimensions(N, N_y, N_z)
+        output.SetOrigin(-D, -D, -D)
+        output.SetSpacing(dx, dx, dx)
+
+        if self.volume_cache_dir:
+            frame_id = self._get_volume_frame_id(waveform_data, t)
+            volume_data = volume_cache.load_volume_frame(
+                self.volume_cache_dir, frame_id
+            )
+            if volume_data is not None:
+                logger.info(f"Loaded volume data at t={t} from cache.")
+                add_volume_data(output, volume_data)
+                return 1
+
+        swsh_grid, r, radial_weight, screened_points = self._get_swsh_grid()
+
+        logger.info(f"Computing volume data at t={t}...")
+        start_time = time.time()
+
+        # Compute scaled waveform phase on the grid
+        retarded_time, shell_index = self._get_retarded_time(r)
+        phase = t - retarded_time
+
+        waveform = self._get_waveform_modes(
+            waveform_data, dtype=swsh_grid.dtype
+        )
+        waveform = self._restrict_waveform(
+            waveform,
+            min_phase=np.min(phase),
+            max_phase=np.max(phase),
+        )
+        points = self._get_points(
+            min_phase=phase,
+            max_phase=phase,
+            waveform_timesteps=waveform.times,
+            shell_index=shell_index,
+            screened_points=screened_points,
+        )
+        if points is not None:
+            logger.debug(
+                f"Computing volume data at {len(points)} of {len(r)} points."
+            )
+        strain, strain_modes = strain_volume.compute_strain(
+            phase,
+            waveform_times=waveform.times,
+            waveform_modes=waveform.modes,
+            dt=waveform.dt,
+            search_table=waveform.search_table,
+            waveform_mode_derivatives=waveform.mode_derivatives,
+            swsh_grid=swsh_grid,
+            swsh_indices=waveform.swsh_indices,
+            radial_weight=radial_weight,
+            mode_offsets=waveform.mode_offsets,
+            shell_index=shell_index,
+            points=points,
+            num_threads=self.num_threads,
+        )
+        volume_data = {}
+        # Expose individual modes in output
+        if self.store_individual_modes:
+            for mode_name, strain_mode in zip(
+                waveform.mode_names, strain_modes.T
+            ):
+                if self.polarizations_selection.ArrayIsEnabled("Plus"):
+                    volume_data[mode_name + " Plus"] = np.real(strain_mode)
+                if self.polarizations_selection.ArrayIsEnabled("Cross"):
+                    volume_data[mode_name + " Cross"] = np.imag(strain_mode)
         if self.polarizations_selection.ArrayIsEnabled("Plus"):
-            strain_real_vtk = vtknp.numpy_to_vtk(np.real(strain), deep=True)
-            strain_real_vtk.SetName("Plus strain")
-            output.GetPointData().AddArray(strain_real_vtk)
+            volume_data["Plus strain"] = np.real(strain)
         if self.polarizations_selection.ArrayIsEnabled("Cross"):
-            strain_imag_vtk = vtknp.numpy_to_vtk(np.imag(strain), deep=True)
-            strain_imag_vtk.SetName("Cross strain")
-            output.GetPointData().AddArray(strain_imag_vtk)
+            volume_data["Cross strain"] = np.imag(strain)
+        add_volume_data(output, volume_data)
+        if self.volume_cache_dir:
+            volume_cache.save_volume_frame(
+                self.volume_cache_dir, frame_id, volume_data
+            )
 
         logger.info(f"Volume data computed in {time.time() - start_time:.3f}s.")
         return 1
@@ -12,3 +12,11 @@ def create_modified_callback(anobject):
             o.Modified()
 
     return _markmodified
+
+
+def get_enabled_arrays(selection):
+    return [
+        selection.GetArrayName(i)
+        for i in range(selection.GetNumberOfArrays())
+        if selection.GetArraySetting(i)
+    ]
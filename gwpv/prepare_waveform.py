@@ -0,0 +1,91 @@
+import logging
+import os
+import shutil
+
+import numpy as np
+
+from gwpv.waveform_data import parse_mode_name, resample_uniform
+from gwpv.waveform_formats import open_waveform_file
+from gwpv.waveform_metadata import waveform_metadata
+
+logger = logging.getLogger(__name__)
+
+
+def prepare_waveform(
+    filename,
+    subfile,
+    output_dir,
+    dt=None,
+    interpolation_order=1,
+    ell_max=None,
+    dtype=np.complex64,
+    force=False,
+):
+    """Convert waveform data to a bundle that is optimized for rendering
+
+    Reads the waveform data once and writes it to the `output_dir` as a
+    directory of '.npy' files that `WaveformDataReader` memory-maps (see
+    `waveform_formats.NumpyWaveformBundle`):
+
+    - 'Time.npy': The uniformly spaced times.
+    - 'Y_l{l}_m{m}.npy': One contiguous complex array per mode.
+
+    The waveform metadata, including the peak amplitude of each mode, is
+    written to a sidecar file alongside (see `waveform_metadata`), so scene
+    defaults don't have to scan the data again.
+
+    Arguments:
+      filename, subfile: The waveform data in any format that
+        `waveform_formats.open_waveform_file` supports.
+      output_dir: The directory to write the bundle to. It must be empty or
+        not exist yet, unless `force` is set and it holds a bundle written
+        before.
+      dt: Spacing of the resampled times. By default, the data is only
+        resampled if it isn't sampled uniformly, using its smallest spacing.
+      interpolation_order: 1 (linear) or 3 (cubic) interpolation for the
+        resampling.
+      ell_max: Only write modes up to this l.
+      dtype: Complex dtype of the modes in the bundle.
+      force: Replace the `output_dir` if it holds a bundle already. Other
+        non-empty directories are never replaced.
+    """
+    # The metadata sidecar file is named after the directory
+    output_dir = os.path.normpath(output_dir)
+    if os.path.isdir(output_dir) and len(os.listdir(output_dir)) > 0:
+        is_bundle = os.path.exists(
+            os.path.join(output_dir, "Time.npy")
+        ) and os.path.exists(output_dir + ".metadata.json")
+        if not (force and is_bundle):
+            raise ValueError(
+                f"Output directory '{output_dir}' is not empty. Choose a new"
+                " directory, or set `force` to replace an existing waveform"
+                " bundle."
+            )
+        logger.info(f"Replacing waveform bundle in '{output_dir}'.")
+        shutil.rmtree(output_dir)
+    waveform_file = open_waveform_file(filename, subfile)
+    mode_names = [
+        mode_name
+        for mode_name in waveform_file.mode_names
+        if ell_max is None or parse_mode_name(mode_name)[0] <= ell_max
+    ]
+    logger.info(f"Reading {len(mode_names)} modes from '{filename}'...")
+    t, modes = waveform_file.read(mode_names)
+    t_dt = np.diff(t)
+    if dt is not None or not np.allclose(t_dt, t_dt[0]):
+        t, modes = resample_uniform(t, modes, dt=dt, order=interpolation_order)
+        logger.info(
+            f"Resampled waveform uniformly to {len(t)} times with"
+            f" dt={t[1] - t[0]:.2e}."
+        )
+    os.makedirs(output_dir, exist_ok=True)
+    np.save(os.path.join(output_dir, "Time.npy"), np.asarray(t, dtype=float))
+    for mode_name, mode_data in modes.items():
+        np.save(
+            os.path.join(output_dir, mode_name + ".npy"),
+            np.ascontiguousarray(
+                mode_data[:, 0] + 1j * mode_data[:, 1], dtype=dtype
+            ),
+        )
+    logger.info(f"Waveform bundle written to '{output_dir}'.")
+    return waveform_metadata(output_dir, subfile=None)
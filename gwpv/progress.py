@@ -29,3 +29,21 @@ render_progress = Progress(
     RenderSpeedColumn(),
     TimeRemainingColumn(),
 )
+
+
+def update_progress(progress, task_id, progress_update, frame_timings=None):
+    """Forward a progress update from `render_frames` to the `progress` display
+
+    Updates either start the task or carry fields like `total`, `advance` or
+    `completed`. The render time of a frame, if the update reports one, is
+    added to the `frame_timings`.
+    """
+    if "start" in progress_update:
+        progress.start_task(task_id)
+        return
+    progress_update = dict(progress_update)
+    frame_i = progress_update.pop("frame", None)
+    frame_time = progress_update.pop("frame_time", None)
+    if frame_timings is not None and frame_i is not None:
+        frame_timings[frame_i] = frame_time
+    progress.update(task_id, **progress_update)
@@ -87,7 +87,7 @@ def render_scene_entrypoint(
     precompute_cached_swsh_grid(scene)
 
     if num_jobs == 1:
-        from gwpv.progress import render_progress
+        from gwpv.progress import render_progress, update_progress
         from gwpv.render.frames import render_frames
 
         with render_progress as progress:
@@ -96,10 +96,7 @@ def render_scene_entrypoint(
                 scene=scene,
                 **kwargs,
             ):
-                if "start" in progress_update:
-                    progress.start_task(task_id)
-                else:
-                    progress.update(task_id, **progress_update)
+                update_progress(progress, task_id, progress_update)
     else:
         from gwpv.render.parallel import render_parallel
 
@@ -219,6 +216,21 @@ def render_waveform_entrypoint(
     render_waveform(scene, **kwargs)
 
 
+def prepare_waveform_entrypoint(waveform_file, precision, **kwargs):
+    import numpy as np
+
+    from gwpv.prepare_waveform import prepare_waveform
+    from gwpv.scene_configuration import parse_as
+
+    filename, subfile = parse_as.file_and_subfile(waveform_file)
+    prepare_waveform(
+        filename,
+        subfile,
+        dtype=dict(single=np.complex64, double=np.complex128)[precision],
+        **kwargs,
+    )
+
+
 def main():
     import argparse
 
@@ -335,7 +347,60 @@ def main():
     parser_waveform.add_argument("--mass", type=float, required=False)
     parser_waveform.add_argument("--bounds", type=float, nargs=2)
 
-    # Common CLI for all entrypoints
+    # `prepare-waveform` CLI
+    parser_prepare_waveform = subparsers.add_parser(
+        "prepare-waveform",
+        help=(
+            "Convert waveform data to a bundle of memory-mapped arrays that"
+            " loads fast in render processes."
+        ),
+    )
+    parser_prepare_waveform.set_defaults(subcommand=prepare_waveform_entrypoint)
+    parser_prepare_waveform.add_argument(
+        "waveform_file",
+        help=(
+            "Waveform data to convert, with an optional subfile separated by a"
+            " colon, e.g. 'rhOverM_Asymptotic_GeometricUnits_CoM.h5:"
+            "Extrapolated_N2.dir'."
+        ),
+    )
+    parser_prepare_waveform.add_argument(
+        "--output-dir",
+        "-o",
+        required=True,
+        help=(
+            "Directory to write the bundle to. Use it as the 'Waveform'"
+            " datasource of a scene."
+        ),
+    )
+    parser_prepare_waveform.add_argument(
+        "--timestep",
+        type=float,
+        dest="dt",
+        help=(
+            "Spacing of the uniformly resampled times. Defaults to the"
+            " smallest spacing in the data."
+        ),
+    )
+    parser_prepare_waveform.add_argument(
+        "--interpolation-order", type=int, choices=[1, 3], default=1
+    )
+    parser_prepare_waveform.add_argument(
+        "--ell-max", type=int, help="Only write modes up to this l."
+    )
+    parser_prepare_waveform.add_argument(
+        "--precision", choices=["single", "double"], default="single"
+    )
+    parser_prepare_waveform.add_argument(
+        "--force",
+        action="store_true",
+        help=(
+            "Replace the output directory if it holds a waveform bundle"
+            " already."
+        ),
+    )
+
+    # Common CLI for all scene entrypoints
     for subparser in [parser_scene, parser_scenes, parser_waveform]:
         subparser.add_argument(
             "--scene-path",
@@ -357,6 +422,14 @@ def main():
             dest="keypath_overrides",
             default=[],
         )
+
+    # Common CLI for all entrypoints
+    for subparser in [
+        parser_scene,
+        parser_scenes,
+        parser_waveform,
+        parser_prepare_waveform,
+    ]:
         subparser.add_argument(
             "--verbose",
             "-v",
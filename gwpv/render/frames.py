@@ -5,7 +5,6 @@ import os
 import sys
 import time
 
-import h5py
 import numpy as np
 import paraview.servermanager as pvserver
 import paraview.simple as pv
@@ -53,10 +52,49 @@ sys.stderr = sys.__stderr__
 sys.stdin = sys.__stdin__
 
 
+def render_time_range(
+    animation_config, waveform_to_volume_configs, frame_window
+):
+    """Range of waveform times that the volume data needs for rendering
+
+    Covers the frame times within the `Animation.Crop` (and the
+    `frame_window`, if given), widened by the time it takes the waves to cross
+    the domain. Returns `None` if the full waveform data is needed.
+    """
+    if "FreezeTime" in animation_config or "Crop" not in animation_config:
+        return None
+    start_time, stop_time = animation_config["Crop"]
+    if frame_window is not None:
+        time_per_frame = (
+            animation_config["Speed"] / animation_config["FrameRate"]
+        )
+        start_time, stop_time = (
+            start_time + frame_window[0] * time_per_frame,
+            start_time + (frame_window[1] - 1) * time_per_frame,
+        )
+    waveform_start_time, waveform_stop_time = np.inf, -np.inf
+    for config in waveform_to_volume_configs:
+        config = config["Object"]
+        # Normalizing modes needs the full waveform data
+        if config.get("NormalizeEachMode", False):
+            return None
+        # Use the `WaveformToVolume` defaults for unspecified properties. The
+        # retarded time ranges over the grid out to its corners.
+        radial_scale = config.get("RadialScale", 10)
+        offset = config.get("ActivationOffset", 10) * radial_scale
+        max_radius = np.sqrt(3) * config.get("Size", 100) * radial_scale
+        waveform_start_time = min(
+            waveform_start_time, start_time - max_radius + offset
+        )
+        waveform_stop_time = max(waveform_stop_time, stop_time + offset)
+    return waveform_start_time, waveform_stop_time
+
+
 def render_frames(
     scene,
     frames_dir=None,
     frame_window=None,
+    frame_chunks=None,
     render_missing_frames=False,
     save_state_to_file=None,
     no_render=False,
@@ -65,6 +103,12 @@ def render_frames(
     """Render the frames for the `scene`
 
     This function `yield`s progress updates.
+
+    The pipeline is set up for all frames in the `frame_window`. To render only
+    some of them, pass an iterable of `frame_chunks`, each a window of frames
+    `(start, stop)` within the `frame_window`. The chunks are drawn only once
+    the pipeline is set up, so they can be streamed in from other processes
+    (see `gwpv.render.parallel`).
     """
     # Validate scene
     if scene["View"]["ViewSize"][0] % 16 != 0:
@@ -98,17 +142,6 @@ def render_frames(
         datasources=scene.get("Datasources", None),
     )
 
-    # Load the waveform data file
-    waveform_h5file, waveform_subfile = parse_as.file_and_subfile(
-        scene["Datasources"]["Waveform"]
-    )
-    waveform_data = WaveformDataReader(
-        FileName=waveform_h5file, Subfile=waveform_subfile
-    )
-    pv.UpdatePipeline()
-
-    # Generate volume data from the waveform. Also sets the available time range.
-    # TODO: Pull KeepEveryNthTimestep out of datasource
     waveform_to_volume_configs = scene["WaveformToVolume"]
     if isinstance(waveform_to_volume_configs, dict):
         waveform_to_volume_configs = [
@@ -120,11 +153,75 @@ def render_frames(
             waveform_to_volume_configs[0]["VolumeRepresentation"] = scene[
                 "VolumeRepresentation"
             ]
+
+    # Load the waveform data file. Only read the modes and the time range that
+    # the volume data needs. The `WaveformToVolume` filter uses modes up to l=2
+    # by default.
+    waveform_h5file, waveform_subfile = parse_as.file_and_subfile(
+        scene["Datasources"]["Waveform"]
+    )
+    waveform_reader_kwargs = {}
+    # Optionally resample the waveform data uniformly when it is loaded, so the
+    # `WaveformToVolume` filter can interpolate it faster
+    if isinstance(scene["Datasources"]["Waveform"], dict):
+        for resample_key in [
+            "ResampleUniform",
+            "ResampleTimestep",
+            "ResampleInterpolationOrder",
+        ]:
+            if resample_key in scene["Datasources"]["Waveform"]:
+                waveform_reader_kwargs[resample_key] = scene["Datasources"][
+                    "Waveform"
+                ][resample_key]
+    # The resampled times and the cached volume data depend on the waveform
+    # data that is read, so only restrict the time range when neither is used.
+    # Otherwise, each frame window would render slightly different volume data.
+    if (
+        not waveform_reader_kwargs.get("ResampleUniform", False)
+        and "VolumeCache" not in scene["Datasources"]
+    ):
+        time_range = render_time_range(
+            scene["Animation"], waveform_to_volume_configs, frame_window
+        )
+        if time_range is not None:
+            logger.debug(f"Reading waveform data in time range {time_range}.")
+            waveform_reader_kwargs["TimeRange"] = time_range
+            # Keep the same samples in every `WaveformToVolume` filter as
+            # without the time range
+            waveform_reader_kwargs["TimeRangeStride"] = int(
+                np.lcm.reduce(
+                    [
+                        config["Object"].get("KeepEveryNthTimestep", 1)
+                        for config in waveform_to_volume_configs
+                    ]
+                )
+            )
+    waveform_data = WaveformDataReader(
+        FileName=waveform_h5file,
+        Subfile=waveform_subfile,
+        EllMax=max(
+            config["Object"].get("EllMax", 2)
+            for config in waveform_to_volume_configs
+        ),
+        **waveform_reader_kwargs,
+    )
+    pv.UpdatePipeline()
+
+    # Generate volume data from the waveform. Also sets the available time range.
+    # TODO: Pull KeepEveryNthTimestep out of datasource
+    # Optionally cache the volume data of every frame, so re-renders that only
+    # change the look of the scene can skip computing it
+    volume_cache_kwargs = {}
+    if "VolumeCache" in scene["Datasources"]:
+        volume_cache_kwargs["VolumeCacheDirectory"] = parse_as.path(
+            scene["Datasources"]["VolumeCache"]
+        )
     waveform_to_volume_objects = []
     for waveform_to_volume_config in waveform_to_volume_configs:
         volume_data = WaveformToVolume(
             WaveformData=waveform_data,
             SwshCacheDirectory=parse_as.path(scene["Datasources"]["SwshCache"]),
+            **volume_cache_kwargs,
             **waveform_to_volume_config["Object"],
         )
         if "Modes" in waveform_to_volume_config["Object"]:
@@ -297,7 +394,10 @@ def render_frames(
             if "Objects" in trajectory_config:
                 with animate.restore_animation_state(animation):
                     follow_traj = FollowTrajectory(
-                        TrajectoryData=traj_data_reader
+                        TrajectoryData=traj_data_reader,
+                        InterpolationOrder=trajectory_config.get(
+                            "InterpolationOrder", 1
+                        ),
                     )
                 for traj_obj_config in trajectory_config["Objects"]:
                     for traj_obj_key in traj_obj_config:
@@ -342,13 +442,20 @@ def render_frames(
                             scene_time_from_real,
                         )
             if "Tail" in trajectory_config:
+                tail_config = trajectory_config["Tail"]
+                if "MaxAge" in tail_config:
+                    tail_max_age = tail_config["MaxAge"]
+                    del tail_config["MaxAge"]
+                else:
+                    tail_max_age = 0.0
                 with animate.restore_animation_state(animation):
-                    traj_tail = TrajectoryTail(TrajectoryData=traj_data_reader)
+                    traj_tail = TrajectoryTail(
+                        TrajectoryData=traj_data_reader, MaxAge=tail_max_age
+                    )
                 if "TimeShift" in trajectory_config:
                     traj_tail = animate.apply_time_shift(
                         traj_tail, trajectory_config["TimeShift"]
                     )
-                tail_config = trajectory_config["Tail"]
                 traj_color_by = config_color.extract_color_by(tail_config)
                 if "Visibility" in tail_config:
                     tail_visibility_config = tail_config["Visibility"]
@@ -369,19 +476,22 @@ def render_frames(
                 logger.debug(
                     f"Animating '{move_config['guiName']}' along trajectory."
                 )
-                with h5py.File(trajectory_file, "r") as traj_data_file:
-                    trajectory_data = np.array(
-                        traj_data_file[trajectory_subfile]
-                    )
-                if radial_scale != 1.0:
-                    trajectory_data[:, 1:] *= radial_scale
-                logger.debug(f"Trajectory data shape: {trajectory_data.shape}")
+                trajectory_datasource = scene["Datasources"]["Trajectories"][
+                    trajectory_name
+                ]
                 animate.follow_path(
                     gui_name=move_config["guiName"],
-                    trajectory_data=trajectory_data,
-                    num_keyframes=move_config["NumKeyframes"],
-                    scene_time_range=time_range_in_M,
-                    normalized_time_from_scene=normalized_time_from_scene,
+                    trajectory_file=parse_as.path(
+                        trajectory_datasource["File"]
+                    ),
+                    coords_dataset=os.path.join(
+                        trajectory_datasource.get("Subfile", "/"),
+                        trajectory_datasource.get(
+                            "CoordinatesDataset", "CoordCenterInertial.dat"
+                        ),
+                    ),
+                    radial_scale=radial_scale,
+                    animation=animation,
                 )
 
     # Add non-spherical horizon shapes (instead of spherical objects following
@@ -542,20 +652,41 @@ def end_cue(self): pass
         # Note that `FrameWindow` appears to be buggy, so we set up the
         # `animation` according to the `frame_window` above so the frame files
         # are numbered correctly.
-        for animation_window_frame_i in range(animation_window_num_frames):
-            frame_i = frame_window[0] + animation_window_frame_i
-            frame_file = os.path.join(frames_dir, f"frame.{frame_i:06d}.png")
-            if render_missing_frames and os.path.exists(frame_file):
-                continue
-            logger.debug(f"Rendering frame {frame_i}...")
-            animation.AnimationTime = (
-                animation.StartTime
-                + time_per_frame_in_M * animation_window_frame_i
+        def frame_scene_time(frame_i):
+            return animation.StartTime + time_per_frame_in_M * (
+                frame_i - frame_window[0]
             )
-            pv.Render()
-            pv.SaveScreenshot(frame_file)
-            logger.info(f"Rendered frame {frame_i}.")
-            yield dict(advance=1)
+
+        def frame_file(frame_i):
+            return os.path.join(frames_dir, f"frame.{frame_i:06d}.png")
+
+        if frame_chunks is None:
+            frame_chunks = [frame_window]
+        for frame_chunk in frame_chunks:
+            chunk_frames = [
+                frame_i
+                for frame_i in range(*frame_chunk)
+                if not (
+                    render_missing_frames
+                    and os.path.exists(frame_file(frame_i))
+                )
+            ]
+            # Compute the volume data of all frames in the chunk at once. The
+            # frames below then load it from the volume cache.
+            if "VolumeCache" in scene["Datasources"]:
+                for waveform_to_volume in waveform_to_volume_objects:
+                    waveform_to_volume.GetClientSideObject().fill_volume_cache(
+                        [frame_scene_time(frame_i) for frame_i in chunk_frames]
+                    )
+            for frame_i in chunk_frames:
+                logger.debug(f"Rendering frame {frame_i}...")
+                frame_start_time = time.time()
+                animation.AnimationTime = frame_scene_time(frame_i)
+                pv.Render()
+                pv.SaveScreenshot(frame_file(frame_i))
+                frame_time = time.time() - frame_start_time
+                logger.info(f"Rendered frame {frame_i} in {frame_time:.2f}s.")
+                yield dict(advance=1, frame=frame_i, frame_time=frame_time)
 
     logger.info(
         f"Rendering done. Total time: {time.time() - render_start_time:.2f}s"
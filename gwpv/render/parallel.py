@@ -3,11 +3,11 @@ import logging
 import multiprocessing
 from logging.handlers import QueueHandler
 
-import h5py
-
-from gwpv.progress import render_progress
+from gwpv.progress import render_progress, update_progress
+from gwpv.render import scheduling
 from gwpv.render.frames import render_frames
 from gwpv.scene_configuration import animate, parse_as
+from gwpv.waveform_metadata import waveform_time_range
 
 logger = logging.getLogger(__name__)
 
@@ -22,11 +22,20 @@ def _init_subprocess(logging_config, logging_queue):
     )
 
 
-def _render_frames_parallel(task_id, progress_queue, **kwargs):
-    """Loops over render_frames and puts progress updates in the queue"""
-    for progress_update in render_frames(**kwargs):
-        progress_update["task_id"] = task_id
+def _render_frames_parallel(frame_chunk_queue, progress_queue, **kwargs):
+    """Renders the frame chunks from the queue with a single pipeline
+
+    The pipeline is set up once, then chunks of frames are drawn from the
+    `frame_chunk_queue` and rendered until `None` is drawn. Progress updates
+    are put in the `progress_queue`, followed by a final `dict(done=True)`.
+    """
+    frame_chunks = iter(frame_chunk_queue.get, None)
+    for progress_update in render_frames(frame_chunks=frame_chunks, **kwargs):
+        # The main process keeps track of the total number of frames
+        if "total" in progress_update:
+            continue
         progress_queue.put(progress_update)
+    progress_queue.put(dict(done=True))
 
 
 def _subprocess_put_error(err, error_queue, progress_queue):
@@ -64,18 +73,14 @@ def render_parallel(
                 scene["Animation"]["Crop"][1] - scene["Animation"]["Crop"][0]
             )
         else:
-            waveform_file_and_subfile = parse_as.file_and_subfile(
-                scene["Datasources"]["Waveform"]
+            start_time, end_time = waveform_time_range(
+                *parse_as.file_and_subfile(scene["Datasources"]["Waveform"])
+            )
+            max_animation_length = end_time - start_time
+            logger.debug(
+                f"Inferred max. animation length {max_animation_length}M"
+                " from waveform data."
             )
-            with h5py.File(waveform_file_and_subfile[0], "r") as waveform_file:
-                waveform_times = waveform_file[waveform_file_and_subfile[1]][
-                    "Y_l2_m2.dat"
-                ][:, 0]
-                max_animation_length = waveform_times[-1] - waveform_times[0]
-                logger.debug(
-                    f"Inferred max. animation length {max_animation_length}M"
-                    " from waveform data."
-                )
         frame_window = (
             0,
             animate.num_frames(
@@ -86,49 +91,60 @@ def render_parallel(
         )
         logger.debug(f"Inferred total frame window: {frame_window}")
 
+    # Hand out small chunks of frames from a shared queue, so processes that
+    # render cheap frames, e.g. early in the inspiral, draw more chunks than
+    # processes that render expensive frames, e.g. around merger. Render times
+    # recorded in earlier renders put the most expensive chunks first.
     num_frames = frame_window[1] - frame_window[0]
-    frames_per_job = int(num_frames / num_jobs)
-    extra_frames = num_frames % num_jobs
+    frames_dir = kwargs.get("frames_dir", None)
+    frame_timings = (
+        scheduling.load_frame_timings(frames_dir)
+        if frames_dir is not None
+        else {}
+    )
+    frame_chunks = scheduling.frame_chunks(
+        frame_window, num_jobs, frame_timings=frame_timings
+    )
     logger.debug(
-        f"Using {num_jobs} jobs with {frames_per_job} frames per job"
-        f" ({extra_frames} jobs render an additional frame)."
+        f"Using {num_jobs} jobs to render {num_frames} frames in"
+        f" {len(frame_chunks)} chunks"
+        + (" ordered by recorded frame timings." if frame_timings else ".")
     )
-
-    frame_windows = []
-    distributed_frames = frame_window[0]
-    for i in range(num_jobs):
-        frames_this_job = frames_per_job + (1 if i < extra_frames else 0)
-        frame_windows.append(
-            (distributed_frames, distributed_frames + frames_this_job)
-        )
-        distributed_frames += frames_this_job
-    logger.debug(f"Frame windows: {frame_windows}")
+    logger.debug(f"Frame chunks: {frame_chunks}")
+    if len(frame_chunks) == 0:
+        logger.warning(f"No frames to render in frame window {frame_window}.")
+        return
+    # Every process sets up the pipeline once, so don't start more processes
+    # than there are chunks to render
+    num_processes = min(num_jobs, len(frame_chunks))
 
     with render_progress as progress:
         with multiprocessing.Manager() as manager:
             logging_queue = manager.Queue()
             progress_queue = manager.Queue()
             error_queue = manager.Queue()
-
+            frame_chunk_queue = manager.Queue()
+            for frame_chunk in frame_chunks:
+                frame_chunk_queue.put(frame_chunk)
+            # Signal the end of the chunks to every process
+            for i in range(num_processes):
+                frame_chunk_queue.put(None)
+
+            task_id = progress.add_task(
+                f"Rendering frames {frame_window[0] + 1} - {frame_window[1]}",
+                total=num_frames,
+                start=False,
+            )
             with multiprocessing.Pool(
-                processes=num_jobs,
+                processes=num_processes,
                 initializer=_init_subprocess,
                 initargs=(subprocess_logging_config, logging_queue),
             ) as pool:
-                for frame_window in frame_windows:
-                    num_frames_this_window = frame_window[1] - frame_window[0]
-                    if num_frames_this_window == 0:
-                        continue
-                    task_id = progress.add_task(
-                        f"Rendering frames {frame_window[0] + 1} -"
-                        f" {frame_window[1]}",
-                        total=num_frames_this_window,
-                        start=False,
-                    )
+                for i in range(num_processes):
                     pool.apply_async(
                         _render_frames_parallel,
                         kwds=dict(
-                            task_id=task_id,
+                            frame_chunk_queue=frame_chunk_queue,
                             progress_queue=progress_queue,
                             scene=scene,
                             frame_window=frame_window,
@@ -143,14 +159,23 @@ def render_parallel(
                 pool.close()
 
                 # Update the display when subprocesses report progress
-                while error_queue.empty() and not progress.finished:
+                num_processes_done = 0
+                new_frame_timings = {}
+                while (
+                    error_queue.empty() and num_processes_done < num_processes
+                ):
                     progress_update = progress_queue.get()
                     if progress_update is None:
                         continue
-                    elif "start" in progress_update:
-                        progress.start_task(progress_update["task_id"])
+                    elif "done" in progress_update:
+                        num_processes_done += 1
                     else:
-                        progress.update(**progress_update)
+                        update_progress(
+                            progress,
+                            task_id,
+                            progress_update,
+                            new_frame_timings,
+                        )
                     while not logging_queue.empty():
                         logger.handle(logging_queue.get())
 
@@ -158,6 +183,10 @@ def render_parallel(
                 while not logging_queue.empty():
                     logger.handle(logging_queue.get())
 
+                # Record frame timings to order the work in later renders
+                if frames_dir is not None and len(new_frame_timings) > 0:
+                    scheduling.save_frame_timings(frames_dir, new_frame_timings)
+
                 # Raise errors from subprocesses
                 if not error_queue.empty():
                     error, cause = error_queue.get()
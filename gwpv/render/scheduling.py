@@ -0,0 +1,86 @@
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Number of chunks per process that `frame_chunks` splits the frames into by
+# default. More chunks balance the load better, but each chunk is a round trip
+# through the shared queue.
+CHUNKS_PER_JOB = 8
+
+FRAME_TIMINGS_FILE = "frame_timings.json"
+
+
+def frame_chunks(frame_window, num_jobs, chunk_size=None, frame_timings=None):
+    """Split the frames into small chunks for dynamic scheduling
+
+    Processes draw the chunks from a shared queue in the returned order, so a
+    process that renders cheap frames simply draws more chunks.
+
+    Arguments:
+      frame_window: The frames to render, `(start, stop)`.
+      num_jobs: The number of processes.
+      chunk_size: The number of frames per chunk. Defaults to a size that
+        gives each process `CHUNKS_PER_JOB` chunks.
+      frame_timings: Optional dictionary of the time it took to render each
+        frame before (see `load_frame_timings`). If given, the most expensive
+        chunks come first, so no process is left with a slow chunk at the end.
+        Frames without timing are assumed to take the average time.
+
+    Returns: List of frame windows `(start, stop)`.
+    """
+    num_frames = frame_window[1] - frame_window[0]
+    if chunk_size is None:
+        chunk_size = max(1, num_frames // (num_jobs * CHUNKS_PER_JOB))
+    chunks = [
+        (chunk_start, min(chunk_start + chunk_size, frame_window[1]))
+        for chunk_start in range(frame_window[0], frame_window[1], chunk_size)
+    ]
+    if frame_timings:
+        mean_frame_time = sum(frame_timings.values()) / len(frame_timings)
+
+        def chunk_cost(chunk):
+            return sum(
+                frame_timings.get(frame_i, mean_frame_time)
+                for frame_i in range(*chunk)
+            )
+
+        chunks.sort(key=chunk_cost, reverse=True)
+    return chunks
+
+
+def load_frame_timings(frames_dir):
+    """Render times of the frames in the `frames_dir`, if recorded before"""
+    timings_file = os.path.join(frames_dir, FRAME_TIMINGS_FILE)
+    try:
+        with open(timings_file, "r") as open_timings_file:
+            return {
+                int(frame_i): frame_time
+                for frame_i, frame_time in json.load(open_timings_file).items()
+            }
+    except (OSError, ValueError) as err:
+        logger.debug(f"No frame timings loaded from '{timings_file}': {err}")
+        return {}
+
+
+def save_frame_timings(frames_dir, frame_timings):
+    """Record render times of frames to order the work in later renders
+
+    Merges the `frame_timings` with those recorded before.
+    """
+    all_frame_timings = load_frame_timings(frames_dir)
+    all_frame_timings.update(frame_timings)
+    timings_file = os.path.join(frames_dir, FRAME_TIMINGS_FILE)
+    try:
+        with open(timings_file, "w") as open_timings_file:
+            json.dump(
+                {
+                    str(frame_i): frame_time
+                    for frame_i, frame_time in sorted(all_frame_timings.items())
+                },
+                open_timings_file,
+                indent=0,
+            )
+    except OSError as err:
+        logger.debug(f"Can't write frame timings to '{timings_file}': {err}")
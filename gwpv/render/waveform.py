@@ -2,7 +2,6 @@ import logging
 from tempfile import NamedTemporaryFile
 
 import astropy.constants as const
-import h5py
 import matplotlib.animation as mpl_animation
 import matplotlib.pyplot as plt
 import numpy as np
@@ -10,6 +9,7 @@ from matplotlib.image import imread
 
 from gwpv.progress import render_progress
 from gwpv.scene_configuration import parse_as
+from gwpv.waveform_formats import open_waveform_file
 
 
 # https://kavigupta.org/2019/05/18/Setting-the-size-of-figures-in-matplotlib/
@@ -55,15 +55,15 @@ def render_waveform(scene, output_file, time_merger, mass, bounds=None):
             *waveform_file_and_subfile
         )
     )
-    with h5py.File(waveform_file_and_subfile[0], "r") as h5_waveform_file:
-        waveform_data = h5_waveform_file[waveform_file_and_subfile[1]]
-        mode = "Y_l2_m2.dat"
-        waveform = np.array(waveform_data[mode][:, 1:])
-        time = np.array(waveform_data[mode][:, 0])
-        logger.debug(
-            f"Waveform has {len(waveform)} samples in time range [{time[0]},"
-            f" {time[-1]}]M"
-        )
+    time, modes = open_waveform_file(*waveform_file_and_subfile).read(
+        ["Y_l2_m2"]
+    )
+    time = np.array(time)
+    waveform = np.array(modes["Y_l2_m2"])
+    logger.debug(
+        f"Waveform has {len(waveform)} samples in time range [{time[0]},"
+        f" {time[-1]}]M"
+    )
 
     crop = np.array(
         scene["Animation"].get("Crop", [time[0], time[-1]]), dtype=np.float
@@ -1,8 +1,12 @@
 import contextlib
 import logging
 
+import h5py
+import numpy as np
 import paraview.simple as pv
 
+from gwpv.trajectory import TrajectoryInterpolant
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,63 +25,85 @@ def get_scene_time(time_config, scene_time_from_real):
     return scene_time_from_real(time_config)
 
 
+# Trajectories that objects follow, keyed by the file, the dataset and the
+# radial scale. The animation cues that `follow_path` creates look them up, so
+# the data is loaded only once per process.
+_followed_paths = {}
+
+
+def load_path(trajectory_file, coords_dataset, radial_scale):
+    """Interpolant of the trajectory coordinates in the file
+
+    The dataset has four columns: time and the three coordinates of the
+    trajectory (see `TrajectoryDataReader`).
+    """
+    path_id = (trajectory_file, coords_dataset, radial_scale)
+    if path_id not in _followed_paths:
+        with h5py.File(trajectory_file, "r") as traj_data_file:
+            trajectory_data = np.array(traj_data_file[coords_dataset])
+        logger.debug(
+            f"Loaded trajectory data with shape {trajectory_data.shape} from"
+            f" '{trajectory_file}:{coords_dataset}'."
+        )
+        _followed_paths[path_id] = TrajectoryInterpolant(
+            trajectory_data[:, 0],
+            {"Points": radial_scale * trajectory_data[:, 1:]},
+        )
+    return _followed_paths[path_id]
+
+
+def move_along_path(
+    gui_name, trajectory_file, coords_dataset, radial_scale, scene_time
+):
+    interpolant = load_path(trajectory_file, coords_dataset, radial_scale)
+    pv.FindSource(gui_name).Center = interpolant(scene_time)["Points"].tolist()
+
+
 def follow_path(
     gui_name,
-    trajectory_data,
-    num_keyframes,
-    scene_time_range,
-    normalized_time_from_scene,
+    trajectory_file,
+    coords_dataset,
+    radial_scale,
+    animation,
 ):
-    # Crop trajectory data
-    trajectory_start_i = 0
-    trajectory_end_i = len(trajectory_data)
-    for i, traj_t in enumerate(trajectory_data[:, 0]):
-        if traj_t < scene_time_range[0]:
-            trajectory_start_i = i
-        else:
-            break
-    for i, traj_t in enumerate(trajectory_data[::-1, 0]):
-        if traj_t > scene_time_range[1]:
-            trajectory_end_i = len(trajectory_data) - i
-        else:
-            break
-    num_traj_datapoints = trajectory_end_i - trajectory_start_i
-    logger.debug(
-        f"Trajectory data for '{gui_name}' cropped to indices"
-        f" ({trajectory_start_i}, {trajectory_end_i}) (that's"
-        f" {num_traj_datapoints} data points between times"
-        f" {trajectory_data[trajectory_start_i, 0]} and"
-        f" {trajectory_data[trajectory_end_i - 1, 0]})."
-    )
-    assert num_keyframes <= num_traj_datapoints, (
-        "Time resolution in trajectory file is not sufficient for"
-        f" {num_keyframes} keyframes."
-    )
-    keep_every_n_traj_sample = int(num_traj_datapoints / num_keyframes)
-    logger.debug(
-        f"Keeping every {keep_every_n_traj_sample}th/nd/st sample in the"
-        " trajectory data."
-    )
-    trajectory_data = trajectory_data[
-        trajectory_start_i:trajectory_end_i:keep_every_n_traj_sample
-    ]
-    trajectory = list(
-        map(
-            lambda i: pv.GetAnimationTrack(
-                "Center", index=i, proxy=pv.FindSource(gui_name)
-            ),
-            range(3),
+    """Move the source named `gui_name` along the trajectory
+
+    Adds a single Python animation cue that interpolates the trajectory data
+    to the current time on every tick, so the trajectory doesn't have to be
+    stored as keyframes. The cue loads the trajectory data from the file, so
+    it also works when the state is loaded in the ParaView GUI. Without an
+    `animation`, e.g. when time is frozen, the source is placed once at the
+    current view time.
+    """
+    if animation is None:
+        move_along_path(
+            gui_name,
+            trajectory_file,
+            coords_dataset,
+            radial_scale,
+            pv.GetActiveView().ViewTime,
         )
+        return
+    # Load the data now so the cue doesn't have to while rendering
+    load_path(trajectory_file, coords_dataset, radial_scale)
+    follow_path_cue = pv.PythonAnimationCue()
+    follow_path_cue.Script = f"""
+def start_cue(self): pass
+
+def tick(self):
+    import paraview.simple as pv
+    from gwpv.scene_configuration import animate
+    animate.move_along_path(
+        {gui_name!r},
+        {trajectory_file!r},
+        {coords_dataset!r},
+        {radial_scale!r},
+        pv.GetActiveView().ViewTime,
     )
-    for i, track in enumerate(trajectory):
-        keyframes = []
-        for traj_sample in trajectory_data:
-            key = pv.CompositeKeyFrame()
-            key.KeyTime = normalized_time_from_scene(traj_sample[0])
-            key.Interpolation = "Ramp"
-            key.KeyValues = [traj_sample[i + 1]]
-            keyframes.append(key)
-        track.KeyFrames = keyframes
+
+def end_cue(self): pass
+"""
+    animation.Cues.append(follow_path_cue)
 
 
 def apply_visibility(
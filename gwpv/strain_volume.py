@@ -0,0 +1,417 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Number of grid points that are processed at once. Intermediate arrays have
+# shape (chunk_size, num_modes), so this bounds the memory overhead of the
+# kernel while keeping the arrays large enough to vectorize well.
+CHUNK_SIZE = 2**16
+
+
+# Largest search table that `search_table` builds, in number of entries
+MAX_SEARCH_TABLE_SIZE = 2**22
+
+
+def search_table(waveform_times, max_size=MAX_SEARCH_TABLE_SIZE):
+    """Lookup table to find the interval of a time in O(1)
+
+    The table divides the time range into bins that are narrower than the
+    smallest spacing of the `waveform_times`, and holds the index of the last
+    waveform time before each bin. Pass it to `interpolation_stencil` to find
+    the interval of each phase without a binary search when the
+    `waveform_times` aren't sampled uniformly.
+
+    Returns `None` if the table would have more than `max_size` entries, e.g.
+    when the waveform has a few very closely spaced samples, or if some
+    waveform times are repeated.
+    """
+    min_dt = np.min(np.diff(waveform_times))
+    # Repeated times can't be separated into bins
+    if min_dt <= 0.0:
+        return None
+    # Make the bins a bit narrower than the smallest spacing so that
+    # round-off never places two waveform times in the same bin
+    bin_width = 0.5 * min_dt
+    num_bins = int(
+        np.ceil((waveform_times[-1] - waveform_times[0]) / bin_width)
+    )
+    if num_bins + 1 > max_size:
+        return None
+    bin_starts = waveform_times[0] + bin_width * np.arange(num_bins + 1)
+    index = np.searchsorted(waveform_times, bin_starts, side="right") - 1
+    return waveform_times[0], bin_width, index.astype(np.int32)
+
+
+def _time_index(phase, waveform_times, dt=None, search_table=None):
+    # Index of the last waveform time before each phase, clipped so that
+    # `index + 1` is valid
+    num_times = len(waveform_times)
+    if dt is not None:
+        # Uniform sampling: compute the index arithmetically
+        index = np.floor((phase - waveform_times[0]) / dt).astype(np.intp)
+    elif search_table is not None:
+        table_start, bin_width, table = search_table
+        bin_index = np.floor((phase - table_start) / bin_width)
+        np.clip(bin_index, 0, len(table) - 1, out=bin_index)
+        index = table[bin_index.astype(np.intp)].astype(np.intp)
+    else:
+        index = np.searchsorted(waveform_times, phase, side="right") - 1
+        np.clip(index, 0, num_times - 2, out=index)
+        return index
+    # Round-off in the arithmetic, or waveform times that are only nearly
+    # uniform, can place the index one interval off. Each bin of the search
+    # table contains at most one waveform time as well, so a single step
+    # corrects the index.
+    np.clip(index, 0, num_times - 2, out=index)
+    index += phase >= waveform_times[index + 1]
+    index -= phase < waveform_times[index]
+    np.clip(index, 0, num_times - 2, out=index)
+    return index
+
+
+def _stencil_fraction(phase, waveform_times, dt=None, search_table=None):
+    # Interval index, fractional position within the interval and mask of
+    # phases outside the `waveform_times`
+    index = _time_index(phase, waveform_times, dt, search_table)
+    lower_times = waveform_times[index]
+    if dt is not None:
+        fraction = (phase - lower_times) / dt
+    else:
+        fraction = (phase - lower_times) / (
+            waveform_times[index + 1] - lower_times
+        )
+    fraction = fraction.astype(phase.dtype, copy=False)
+    outside = (phase < waveform_times[0]) | (phase > waveform_times[-1])
+    fraction[outside] = 0.0
+    return index, fraction, outside
+
+
+def interpolation_stencil(phase, waveform_times, dt=None, search_table=None):
+    """Indices and weights for linear interpolation in time
+
+    Returns `index`, `lower_weight` and `upper_weight` so that a quantity `f`
+    sampled at the `waveform_times` is interpolated to the `phase` as
+
+        lower_weight * f[index] + upper_weight * f[index + 1].
+
+    Like `np.interp(phase, waveform_times, f, left=0., right=0.)`, the weights
+    vanish where the `phase` lies outside the `waveform_times`. The weights
+    have the dtype of the `phase`.
+
+    When the `waveform_times` are sampled uniformly with spacing `dt`, pass
+    the `dt` to compute the indices arithmetically instead of with a binary
+    search. Otherwise, pass a `search_table` (see `search_table`) to look them
+    up in O(1).
+    """
+    index, upper_weight, outside = _stencil_fraction(
+        phase, waveform_times, dt, search_table
+    )
+    lower_weight = 1.0 - upper_weight
+    lower_weight[outside] = 0.0
+    return index, lower_weight, upper_weight
+
+
+def hermite_stencil(phase, waveform_times, dt=None, search_table=None):
+    """Indices and weights for cubic Hermite interpolation in time
+
+    Returns `index` and the four weights `lower_weight`, `upper_weight`,
+    `lower_derivative_weight` and `upper_derivative_weight` so that a quantity
+    `f` with time derivative `df` is interpolated to the `phase` as
+
+        lower_weight * f[index] + upper_weight * f[index + 1]
+        + lower_derivative_weight * df[index]
+        + upper_derivative_weight * df[index + 1].
+
+    The weights vanish outside the `waveform_times`. See
+    `interpolation_stencil` for the `dt` and `search_table` arguments.
+    """
+    index, s, outside = _stencil_fraction(
+        phase, waveform_times, dt, search_table
+    )
+    if dt is not None:
+        interval = np.asarray(dt, dtype=phase.dtype)
+    else:
+        interval = (waveform_times[index + 1] - waveform_times[index]).astype(
+            phase.dtype, copy=False
+        )
+    lower_weight = (1.0 + 2.0 * s) * (1.0 - s) ** 2
+    lower_weight[outside] = 0.0
+    upper_weight = s**2 * (3.0 - 2.0 * s)
+    lower_derivative_weight = interval * s * (1.0 - s) ** 2
+    lower_derivative_weight[outside] = 0.0
+    upper_derivative_weight = interval * s**2 * (s - 1.0)
+    return (
+        index,
+        lower_weight,
+        upper_weight,
+        lower_derivative_weight,
+        upper_derivative_weight,
+    )
+
+
+def mode_derivatives(waveform_times, waveform_modes):
+    """Time derivatives of the `waveform_modes` for cubic Hermite interpolation
+
+    Uses second-order finite differences. The `waveform_modes` have shape
+    (num_times, num_modes).
+    """
+    return np.gradient(waveform_modes, waveform_times, axis=0).astype(
+        waveform_modes.dtype, copy=False
+    )
+
+
+def interpolate(
+    phase,
+    waveform_times,
+    waveform_modes,
+    dt=None,
+    search_table=None,
+    waveform_mode_derivatives=None,
+):
+    """Interpolate all `waveform_modes` to the `phase` at once
+
+    The `waveform_modes` have shape (num_times, num_modes). Returns an array
+    of shape (len(phase), num_modes) that is zero outside the `waveform_times`.
+
+    Interpolates linearly, or with cubic Hermite polynomials if the
+    `waveform_mode_derivatives` are given (see `mode_derivatives`). See
+    `interpolation_stencil` for the `dt` and `search_table` arguments.
+    """
+    if waveform_mode_derivatives is None:
+        index, lower_weight, upper_weight = interpolation_stencil(
+            phase, waveform_times, dt, search_table
+        )
+        return (
+            lower_weight[:, np.newaxis] * waveform_modes[index]
+            + upper_weight[:, np.newaxis] * waveform_modes[index + 1]
+        )
+    index, *weights = hermite_stencil(phase, waveform_times, dt, search_table)
+    result = weights[0][:, np.newaxis] * waveform_modes[index]
+    result += weights[1][:, np.newaxis] * waveform_modes[index + 1]
+    result += weights[2][:, np.newaxis] * waveform_mode_derivatives[index]
+    result += weights[3][:, np.newaxis] * waveform_mode_derivatives[index + 1]
+    return result
+
+
+def _gather_swsh(swsh_grid, points, swsh_indices):
+    # Select the outer product of points and modes from a dense grid. Other
+    # grid types, like an `InterpolatedSwshGrid`, do this already.
+    if isinstance(swsh_grid, np.ndarray) and not isinstance(points, slice):
+        return swsh_grid[points[:, np.newaxis], swsh_indices]
+    return swsh_grid[points, swsh_indices]
+
+
+def compute_strain(
+    phase,
+    waveform_times,
+    waveform_modes,
+    swsh_grid,
+    swsh_indices,
+    radial_weight=None,
+    mode_offsets=None,
+    shell_index=None,
+    points=None,
+    chunk_size=CHUNK_SIZE,
+    num_threads=1,
+    dt=None,
+    search_table=None,
+    waveform_mode_derivatives=None,
+):
+    """Compute the strain on the grid from all waveform modes at once
+
+    Evaluates
+
+        h(x) = radial_weight(x) * sum_k h_k(phase(x)) * swsh_grid[x, index_k]
+
+    in a single pass over the grid. The interpolation stencil is computed once
+    per grid point and shared by all modes, and the grid is processed in chunks
+    of `chunk_size` points so intermediate arrays stay small.
+
+    When a `shell_index` is given, the `phase` is specified per radial shell
+    instead of per grid point (see `swsh_cache.cached_radial_shells`). The
+    modes are then interpolated once per shell and gathered to the grid points
+    through the `shell_index`.
+
+    Arguments:
+      phase: Retarded time at each grid point, shape (num_points,), or at each
+        radial shell if a `shell_index` is given.
+      waveform_times: Times at which the waveform modes are sampled, shape
+        (num_times,).
+      waveform_modes: Complex waveform modes, shape (num_times, num_modes).
+      swsh_grid: SWSHs on the grid, shape (num_points, num_swsh). Can also be
+        any object that supports indexing as `swsh_grid[points, indices]`,
+        like an `InterpolatedSwshGrid`.
+      swsh_indices: Index into the last dimension of the `swsh_grid` for each
+        of the `waveform_modes`, shape (num_modes,).
+      radial_weight: Optional weight for each grid point, shape (num_points,).
+      mode_offsets: Optional start indices of consecutive groups of the
+        `waveform_modes` that should also be returned individually, e.g. the
+        +m and -m modes that form an (l, |m|) mode.
+      shell_index: Optional index of the radial shell that each grid point
+        belongs to, shape (num_points,).
+      points: Optional sorted indices of the grid points at which the strain is
+        evaluated. The strain at all other points is zero. Use this to skip
+        points that don't contribute, e.g. where the `phase` lies outside the
+        `waveform_times`.
+      chunk_size: Number of grid points that are processed at once.
+      num_threads: Number of threads that process chunks of the grid in
+        parallel. NumPy releases the GIL for the bulk of the work, so a single
+        process can use all cores of a node.
+      dt, search_table: Optional spacing of uniformly sampled
+        `waveform_times`, or lookup table for other `waveform_times`, to find
+        the interpolation stencil in O(1). See `interpolation_stencil`.
+      waveform_mode_derivatives: Optional time derivatives of the
+        `waveform_modes` to interpolate with cubic Hermite polynomials instead
+        of linearly. See `mode_derivatives`.
+
+    Returns: The strain with shape (num_points,) and the dtype of the
+      `waveform_modes`. If `mode_offsets` are given, also returns the strain of
+      each group of modes with shape (num_points, len(mode_offsets)).
+    """
+    num_points = len(phase) if shell_index is None else len(shell_index)
+    num_evaluated_points = num_points if points is None else len(points)
+    strain = np.zeros(num_points, dtype=waveform_modes.dtype)
+    strain_modes = (
+        np.zeros((num_points, len(mode_offsets)), dtype=waveform_modes.dtype)
+        if mode_offsets is not None
+        else None
+    )
+    if len(swsh_indices) == 0:
+        return (strain, strain_modes) if mode_offsets is not None else strain
+    interpolation_kwargs = dict(
+        dt=dt,
+        search_table=search_table,
+        waveform_mode_derivatives=waveform_mode_derivatives,
+    )
+    if shell_index is not None:
+        shell_waveform_modes = interpolate(
+            phase, waveform_times, waveform_modes, **interpolation_kwargs
+        )
+
+    def evaluate_chunk(start):
+        stop = min(start + chunk_size, num_evaluated_points)
+        chunk = slice(start, stop) if points is None else points[start:stop]
+        if shell_index is not None:
+            contributions = shell_waveform_modes[shell_index[chunk]]
+        else:
+            contributions = interpolate(
+                phase[chunk],
+                waveform_times,
+                waveform_modes,
+                **interpolation_kwargs,
+            )
+        contributions *= _gather_swsh(swsh_grid, chunk, swsh_indices)
+        if radial_weight is not None:
+            contributions *= radial_weight[chunk, np.newaxis]
+        if mode_offsets is not None:
+            chunk_strain_modes = np.add.reduceat(
+                contributions, mode_offsets, axis=1
+            )
+            strain_modes[chunk] = chunk_strain_modes
+            strain[chunk] = np.sum(chunk_strain_modes, axis=1)
+        else:
+            strain[chunk] = np.sum(contributions, axis=1)
+
+    chunk_starts = range(0, num_evaluated_points, chunk_size)
+    if num_threads > 1:
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            # Consume the iterator to re-raise exceptions from the threads
+            list(executor.map(evaluate_chunk, chunk_starts))
+    else:
+        for start in chunk_starts:
+            evaluate_chunk(start)
+    return (strain, strain_modes) if mode_offsets is not None else strain
+
+
+def compute_strain_batch(
+    times,
+    retarded_time,
+    waveform_times,
+    waveform_modes,
+    swsh_grid,
+    swsh_indices,
+    radial_weight=None,
+    shell_index=None,
+    points=None,
+    chunk_size=CHUNK_SIZE,
+    num_threads=1,
+    dt=None,
+    search_table=None,
+    waveform_mode_derivatives=None,
+    out=None,
+):
+    """Compute the strain on the grid at a batch of times at once
+
+    Evaluates the same strain as `compute_strain` at all `times`, where the
+    phase at time `t` is `t - retarded_time`. The SWSHs and the radial weight
+    are gathered only once per chunk of grid points and contracted with the
+    waveform modes at all times at once, so this is much faster than calling
+    `compute_strain` for every time.
+
+    Arguments:
+      times: Times at which to compute the strain, shape (num_times,).
+      retarded_time: Offset of the phase at each grid point, shape
+        (num_points,), or at each radial shell if a `shell_index` is given.
+      waveform_times, waveform_modes, swsh_grid, swsh_indices, radial_weight,
+        shell_index, points, num_threads, dt, search_table,
+        waveform_mode_derivatives: See `compute_strain`.
+      chunk_size: Number of values (grid points times `times`) that are
+        processed at once.
+      out: Optional array of shape (num_times, num_points) to write the strain
+        to, e.g. a memory map created with `np.lib.format.open_memmap` to write
+        the strain to a file.
+
+    Returns: The strain with shape (num_times, num_points) and the dtype of
+      the `waveform_modes`, or `out` if it was given.
+    """
+    times = np.asarray(times)
+    num_times = len(times)
+    num_points = len(retarded_time) if shell_index is None else len(shell_index)
+    num_evaluated_points = num_points if points is None else len(points)
+    if out is None:
+        out = np.zeros((num_times, num_points), dtype=waveform_modes.dtype)
+    elif points is not None or len(swsh_indices) == 0:
+        out[...] = 0.0
+    if len(swsh_indices) == 0 or num_times == 0:
+        return out
+    num_modes = waveform_modes.shape[1]
+
+    def interpolate_batch(batch_retarded_time):
+        phase = (
+            times[:, np.newaxis] - batch_retarded_time[np.newaxis, :]
+        ).astype(retarded_time.dtype, copy=False)
+        return interpolate(
+            phase.ravel(),
+            waveform_times,
+            waveform_modes,
+            dt=dt,
+            search_table=search_table,
+            waveform_mode_derivatives=waveform_mode_derivatives,
+        ).reshape(num_times, len(batch_retarded_time), num_modes)
+
+    if shell_index is not None:
+        shell_waveform_modes = interpolate_batch(retarded_time)
+    # Intermediate arrays have shape (num_times, points_per_chunk, num_modes)
+    points_per_chunk = max(1, chunk_size // num_times)
+
+    def evaluate_chunk(start):
+        stop = min(start + points_per_chunk, num_evaluated_points)
+        chunk = slice(start, stop) if points is None else points[start:stop]
+        if shell_index is not None:
+            contributions = shell_waveform_modes[:, shell_index[chunk]]
+        else:
+            contributions = interpolate_batch(retarded_time[chunk])
+        swsh = _gather_swsh(swsh_grid, chunk, swsh_indices)
+        if radial_weight is not None:
+            swsh = swsh * radial_weight[chunk, np.newaxis]
+        out[:, chunk] = np.einsum("tpk,pk->tp", contributions, swsh)
+
+    chunk_starts = range(0, num_evaluated_points, points_per_chunk)
+    if num_threads > 1:
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            # Consume the iterator to re-raise exceptions from the threads
+            list(executor.map(evaluate_chunk, chunk_starts))
+    else:
+        for start in chunk_starts:
+            evaluate_chunk(start)
+    return out
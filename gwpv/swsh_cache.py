@@ -9,23 +9,244 @@ import rich.progress
 from gwpv.scene_configuration import parse_as
 
 
-def cached_swsh_grid(
-    size,
-    num_points,
+def complex_dtype(precision):
+    """The complex dtype for a `Precision` property value
+
+    The `precision` is the number of bits per real number, either 32 or 64, or
+    the corresponding enumeration text "Single" or "Double".
+    """
+    return np.complex64 if precision in (32, "32", "Single") else np.complex128
+
+
+def reflected_mode_indices(spin_weight, ell_max):
+    """Mode permutation and signs that map SWSHs to their z-reflection
+
+    The SWSHs at the reflected point (x, y, -z), i.e. at polar angle
+    pi - theta, are related to those at (x, y, z) by
+
+        sYlm(pi - theta, phi) = (-1)^(l + s) * conj(sY{l,-m}(theta, phi)).
+
+    Returns the index array `indices` and the array `signs` so that the
+    reflected grid is `signs * np.conj(swsh_grid[:, indices])`.
+    """
+    indices = []
+    signs = []
+    for l in range(ell_max + 1):
+        for m in range(-l, l + 1):
+            indices.append(l * (l + 1) - m)
+            signs.append((-1) ** ((l + spin_weight) % 2))
+    return np.array(indices), np.array(signs)
+
+
+def _compute_swsh(th, phi, spin_weight, ell_max, description):
+    logger = logging.getLogger(__name__)
+    logger.info("Loading 'spherical' module...")
+    import quaternionic
+    import spherical
+
+    logger.info("'spherical' module loaded.")
+    with rich.progress.Progress(
+        rich.progress.TextColumn("[progress.description]{task.description}"),
+        rich.progress.SpinnerColumn(
+            spinner_name="simpleDots", finished_text="... done."
+        ),
+        rich.progress.TimeElapsedColumn(),
+    ) as progress:
+        task_id = progress.add_task(description, total=1)
+        angles = quaternionic.array.from_spherical_coordinates(th, phi)
+        swsh = spherical.Wigner(ell_max).sYlm(s=spin_weight, R=angles)
+        progress.update(task_id, completed=1)
+    return swsh
+
+
+def cached_swsh_table(
+    angular_resolution,
     spin_weight,
     ell_max,
-    clip_y_normal,
-    clip_z_normal,
     cache_dir=None,
+    dtype=np.complex128,
 ):
+    """Retrieve the SWSHs on a uniform (theta, phi) table
+
+    The table has `angular_resolution` points in theta, covering [0, pi], and
+    `2 * angular_resolution + 1` points in phi, covering [-pi, pi] including
+    both ends so interpolation needs no wrap-around. Returns the table with
+    shape `(num_theta, num_phi, (ell_max + 1)**2)` and the given `dtype`.
+    """
     logger = logging.getLogger(__name__)
+    th = np.linspace(0.0, np.pi, angular_resolution)
+    phi = np.linspace(-np.pi, np.pi, 2 * angular_resolution + 1)
+    swsh_table_cache_file = None
+    if cache_dir:
+        swsh_table_id = (
+            int(angular_resolution),
+            int(spin_weight),
+            int(ell_max),
+        )
+        if np.dtype(dtype) != np.complex128:
+            swsh_table_id += (np.dtype(dtype).name,)
+        # Create a somewhat unique filename
+        swsh_table_hash = (
+            int(
+                hashlib.md5(repr(swsh_table_id).encode("utf-8")).hexdigest(), 16
+            )
+            % 10**8
+        )
+        swsh_table_cache_file = os.path.join(
+            cache_dir,
+            f"swsh_table_A{int(angular_resolution)}_{str(swsh_table_hash)}.npy",
+        )
+        if os.path.exists(swsh_table_cache_file):
+            logger.debug(
+                f"Loading SWSH table from file '{swsh_table_cache_file}'..."
+            )
+            return np.load(swsh_table_cache_file)
+        logger.debug(f"No SWSH table file '{swsh_table_cache_file}' found.")
+    logger.info("No cached SWSH table found, computing now...")
+    th_table, phi_table = np.meshgrid(th, phi, indexing="ij")
+    swsh_table = (
+        _compute_swsh(
+            th=th_table.flatten(),
+            phi=phi_table.flatten(),
+            spin_weight=spin_weight,
+            ell_max=ell_max,
+            description="Computing SWSH table",
+        )
+        .reshape(len(th), len(phi), -1)
+        .astype(dtype, copy=False)
+    )
+    if swsh_table_cache_file is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.save(swsh_table_cache_file, swsh_table)
+        logger.debug(
+            f"SWSH table cache saved to file '{swsh_table_cache_file}'."
+        )
+    return swsh_table
+
+
+class InterpolatedSwshGrid:
+    """SWSHs on a Cartesian grid, interpolated from an angular table on access
+
+    Stores only the angular table from `cached_swsh_table` and the location of
+    each grid point in the table, so its memory footprint is
+    O(num_angles * num_modes + num_points) instead of
+    O(num_points * num_modes) for the dense grid. It is indexed like the dense
+    grid, e.g. `swsh_grid[:, mode_index]`, and bilinearly interpolates the
+    requested modes to the requested points. When indexed with an array of
+    points and an array of modes, it selects all modes at all points like
+    `swsh_grid[np.ix_(points, modes)]` does for the dense grid.
+    """
+
+    def __init__(self, swsh_table, th, phi):
+        self.swsh_table = swsh_table
+        num_th, num_phi, num_modes = swsh_table.shape
+        self.shape = (len(th), num_modes)
+        self.dtype = swsh_table.dtype
+        th_index = th / np.pi * (num_th - 1)
+        phi_index = (phi + np.pi) / (2.0 * np.pi) * (num_phi - 1)
+        self._th_index = np.clip(th_index.astype(np.int32), 0, num_th - 2)
+        self._phi_index = np.clip(phi_index.astype(np.int32), 0, num_phi - 2)
+        self._th_weight = (th_index - self._th_index).astype(np.float32)
+        self._phi_weight = (phi_index - self._phi_index).astype(np.float32)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        points, modes = key
+        th_index = self._th_index[points]
+        phi_index = self._phi_index[points]
+        th_weight = self._th_weight[points]
+        phi_weight = self._phi_weight[points]
+        table = self.swsh_table[..., modes]
+        if table.ndim == 3:
+            th_weight = th_weight[:, np.newaxis]
+            phi_weight = phi_weight[:, np.newaxis]
+        return (1.0 - th_weight) * (
+            (1.0 - phi_weight) * table[th_index, phi_index]
+            + phi_weight * table[th_index, phi_index + 1]
+        ) + th_weight * (
+            (1.0 - phi_weight) * table[th_index + 1, phi_index]
+            + phi_weight * table[th_index + 1, phi_index + 1]
+        )
+
+
+def _grid_coordinates(size, num_points, clip_y_normal, clip_z_normal):
     X = np.linspace(-size, size, num_points)
     Y = np.linspace(-size, 0, num_points // 2) if clip_y_normal else X
     Z = np.linspace(-size, 0, num_points // 2) if clip_z_normal else X
     x, y, z = map(
         lambda arr: arr.flatten(order="F"), np.meshgrid(X, Y, Z, indexing="ij")
     )
+    return X, Y, Z, x, y, z
+
+
+def cached_swsh_grid(
+    size,
+    num_points,
+    spin_weight,
+    ell_max,
+    clip_y_normal,
+    clip_z_normal,
+    cache_dir=None,
+    mmap=False,
+    reflection_symmetry=False,
+    angular_resolution=None,
+    dtype=np.complex128,
+):
+    """Retrieve the SWSHs on a Cartesian grid, computing them if needed
+
+    Returns the SWSH grid with shape `(num_points**3, (ell_max + 1)**2)` (fewer
+    points when clipping) and the radial coordinate at each grid point.
+
+    When `mmap` is enabled and a `cache_dir` is provided, the cached grid is
+    opened read-only with `np.load(..., mmap_mode="r")` instead of being read
+    into memory. All processes that render from the same cache file then share
+    the operating system's page cache for the grid, and startup does no read
+    at all. The returned array is read-only in this case.
+
+    When `reflection_symmetry` is enabled, only the SWSHs in the z <= 0 half of
+    the grid are computed and cached. The other half is rebuilt from the
+    reflection relation implemented in `reflected_mode_indices`, which halves
+    the time to compute the grid and the size of the cache file. The rebuilt
+    grid lives in memory, so `mmap` only has an effect without
+    `reflection_symmetry`.
+
+    When an `angular_resolution` is provided, the SWSHs are not stored for each
+    grid point. Instead, they are computed on a (theta, phi) table with
+    `cached_swsh_table` and an `InterpolatedSwshGrid` is returned that
+    interpolates from the table when indexed. This needs far less memory for
+    large grids.
+
+    The SWSHs are computed in double precision and cached with the given
+    `dtype`. Pass `np.complex64` to halve the memory and file size of the grid.
+    """
+    logger = logging.getLogger(__name__)
+    X, Y, Z, x, y, z = _grid_coordinates(
+        size, num_points, clip_y_normal, clip_z_normal
+    )
     r = np.sqrt(x**2 + y**2 + z**2)
+    if angular_resolution:
+        swsh_table = cached_swsh_table(
+            angular_resolution=angular_resolution,
+            spin_weight=spin_weight,
+            ell_max=ell_max,
+            cache_dir=cache_dir,
+            dtype=dtype,
+        )
+        with np.errstate(invalid="ignore"):
+            th = np.nan_to_num(np.arccos(z / r))
+        phi = np.arctan2(y, x)
+        return InterpolatedSwshGrid(swsh_table, th=th, phi=phi), r
+    # The grid is symmetric under z -> -z unless it is clipped along z. With
+    # the "F" ordering above, z is the slowest-varying coordinate so the z <= 0
+    # half is a contiguous block of points at the start of the grid.
+    reflection_symmetry = reflection_symmetry and not clip_z_normal
+    num_points_z = len(Z)
+    num_points_half_z = (num_points_z + 1) // 2
+    num_stored_points = (
+        len(X) * len(Y) * num_points_half_z if reflection_symmetry else len(r)
+    )
     swsh_grid = None
     if cache_dir:
         swsh_grid_id = (
@@ -36,6 +257,10 @@ def cached_swsh_grid(
             bool(clip_y_normal),
             bool(clip_z_normal),
         )
+        if reflection_symmetry:
+            swsh_grid_id += ("reflection_symmetry",)
+        if np.dtype(dtype) != np.complex128:
+            swsh_grid_id += (np.dtype(dtype).name,)
         # Create a somewhat unique filename
         swsh_grid_hash = (
             int(hashlib.md5(repr(swsh_grid_id).encode("utf-8")).hexdigest(), 16)
@@ -43,49 +268,123 @@ def cached_swsh_grid(
         )
         swsh_grid_cache_file = os.path.join(
             cache_dir,
-            f"swsh_grid_D{int(size)}_N{int(num_points)}_{str(swsh_grid_hash)}.npy",
+            f"swsh_grid_D{int(size)}_N{int(num_points)}_{str(swsh_grid_hash)}"
+            + ("_half" if reflection_symmetry else "")
+            + ".npy",
         )
         if os.path.exists(swsh_grid_cache_file):
             logger.debug(
                 f"Loading SWSH grid from file '{swsh_grid_cache_file}'..."
             )
-            swsh_grid = np.load(swsh_grid_cache_file)
+            swsh_grid = np.load(
+                swsh_grid_cache_file,
+                mmap_mode="r" if mmap and not reflection_symmetry else None,
+            )
         else:
             logger.debug(f"No SWSH grid file '{swsh_grid_cache_file}' found.")
     if swsh_grid is None:
         logger.info("No cached SWSH grid found, computing now...")
-        logger.info("Loading 'spherical' module...")
-        import quaternionic
-        import spherical
-
-        logger.info("'spherical' module loaded.")
-        with rich.progress.Progress(
-            rich.progress.TextColumn(
-                "[progress.description]{task.description}"
-            ),
-            rich.progress.SpinnerColumn(
-                spinner_name="simpleDots", finished_text="... done."
-            ),
-            rich.progress.TimeElapsedColumn(),
-        ) as progress:
-            task_id = progress.add_task("Computing SWSH grid", total=1)
-            th = np.arccos(z / r)
-            phi = np.arctan2(y, x)
-            angles = quaternionic.array.from_spherical_coordinates(th, phi)
-            swsh_grid = spherical.Wigner(ell_max).sYlm(s=spin_weight, R=angles)
-            if cache_dir:
-                if not os.path.exists(cache_dir):
-                    os.makedirs(cache_dir)
-                if not os.path.exists(swsh_grid_cache_file):
-                    np.save(swsh_grid_cache_file, swsh_grid)
-                    logger.debug(
-                        "SWSH grid cache saved to file"
-                        f" '{swsh_grid_cache_file}'."
-                    )
-            progress.update(task_id, completed=1)
+        stored_points = slice(0, num_stored_points)
+        swsh_grid = _compute_swsh(
+            th=np.arccos(z[stored_points] / r[stored_points]),
+            phi=np.arctan2(y[stored_points], x[stored_points]),
+            spin_weight=spin_weight,
+            ell_max=ell_max,
+            description="Computing SWSH grid",
+        ).astype(dtype, copy=False)
+        if cache_dir:
+            if not os.path.exists(cache_dir):
+                os.makedirs(cache_dir)
+            if not os.path.exists(swsh_grid_cache_file):
+                np.save(swsh_grid_cache_file, swsh_grid)
+                logger.debug(
+                    f"SWSH grid cache saved to file '{swsh_grid_cache_file}'."
+                )
+            if mmap and not reflection_symmetry:
+                # Drop the computed grid in favor of the file mapping so this
+                # process shares the page cache with the others
+                swsh_grid = np.load(swsh_grid_cache_file, mmap_mode="r")
+    if reflection_symmetry:
+        logger.debug("Rebuilding the z > 0 half of the SWSH grid.")
+        indices, signs = reflected_mode_indices(spin_weight, ell_max)
+        num_points_xy = len(X) * len(Y)
+        stored_half = swsh_grid.reshape(num_points_half_z, num_points_xy, -1)
+        # Point (i, j, k) is the reflection of (i, j, num_points_z - 1 - k)
+        reflected_half = stored_half[
+            num_points_z // 2 - 1 :: -1, :, indices
+        ] * signs.astype(swsh_grid.real.dtype).reshape(1, 1, -1)
+        swsh_grid = np.concatenate(
+            [stored_half, np.conj(reflected_half, out=reflected_half)]
+        ).reshape(len(r), -1)
     return swsh_grid, r
 
 
+def cached_radial_shells(
+    size,
+    num_points,
+    clip_y_normal,
+    clip_z_normal,
+    shell_width,
+    cache_dir=None,
+):
+    """Group the points of the grid into thin radial shells
+
+    Quantities that depend only on the radius, like the retarded time, can be
+    evaluated once per shell instead of once per grid point. The `shell_width`
+    is given in units of the grid spacing. Points whose radii round to the same
+    multiple of the `shell_width` share a shell.
+
+    Returns the radius of each shell, which is the mean radius of the points in
+    it, and the index of the shell that each grid point belongs to.
+    """
+    logger = logging.getLogger(__name__)
+    shells_cache_file = None
+    if cache_dir:
+        shells_id = (
+            round(float(size), 3),
+            int(num_points),
+            bool(clip_y_normal),
+            bool(clip_z_normal),
+            round(float(shell_width), 6),
+        )
+        # Create a somewhat unique filename
+        shells_hash = (
+            int(hashlib.md5(repr(shells_id).encode("utf-8")).hexdigest(), 16)
+            % 10**8
+        )
+        shells_cache_file = os.path.join(
+            cache_dir,
+            f"radial_shells_D{int(size)}_N{int(num_points)}_{str(shells_hash)}"
+            ".npz",
+        )
+        if os.path.exists(shells_cache_file):
+            logger.debug(
+                f"Loading radial shells from file '{shells_cache_file}'..."
+            )
+            with np.load(shells_cache_file) as shells_file:
+                return shells_file["radii"], shells_file["index"]
+        logger.debug(f"No radial shells file '{shells_cache_file}' found.")
+    _, _, _, x, y, z = _grid_coordinates(
+        size, num_points, clip_y_normal, clip_z_normal
+    )
+    r = np.sqrt(x**2 + y**2 + z**2)
+    spacing = 2.0 * size / (num_points - 1)
+    _, shell_index = np.unique(
+        np.round(r / (shell_width * spacing)).astype(np.int64),
+        return_inverse=True,
+    )
+    shell_index = shell_index.reshape(r.shape).astype(np.int32)
+    shell_radii = np.bincount(shell_index, weights=r) / np.bincount(shell_index)
+    logger.debug(
+        f"Grouped {len(r)} grid points into {len(shell_radii)} radial shells."
+    )
+    if shells_cache_file is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.savez(shells_cache_file, radii=shell_radii, index=shell_index)
+        logger.debug(f"Radial shells saved to file '{shells_cache_file}'.")
+    return shell_radii, shell_index
+
+
 def precompute_cached_swsh_grid(scene):
     if "WaveformToVolume" not in scene:
         return
@@ -99,5 +398,17 @@ def precompute_cached_swsh_grid(scene):
         ell_max=config.get("EllMax", 2),
         clip_y_normal=config.get("ClipYNormal", False),
         clip_z_normal=config.get("ClipZNormal", False),
+        reflection_symmetry=config.get("SwshCacheReflectionSymmetry", False),
+        angular_resolution=config.get("SwshAngularResolution", 0),
+        dtype=complex_dtype(config.get("Precision", 64)),
         cache_dir=parse_as.path(scene["Datasources"]["SwshCache"]),
     )
+    if config.get("RadialShellWidth", 0) > 0:
+        cached_radial_shells(
+            size=config.get("Size", 100),
+            num_points=config.get("SpatialResolution", 100),
+            clip_y_normal=config.get("ClipYNormal", False),
+            clip_z_normal=config.get("ClipZNormal", False),
+            shell_width=config["RadialShellWidth"],
+            cache_dir=parse_as.path(scene["Datasources"]["SwshCache"]),
+        )
@@ -0,0 +1,82 @@
+import numpy as np
+
+from gwpv.strain_volume import interpolate, mode_derivatives
+
+
+class TrajectoryInterpolant:
+    """Interpolate all data along a trajectory to any time at once
+
+    Stacks the `columns`, e.g. the coordinates of the trajectory and
+    additional datasets like spins and masses, into a single array so that
+    interpolating them to a time takes a single gather. Build the interpolant
+    once and evaluate it for every frame.
+
+    Arguments:
+      times: The sorted times at which the data is sampled, shape (num_times,).
+      columns: Dictionary of arrays with shape (num_times, ...).
+      order: Interpolation order, either 1 (linear) or 3 (cubic Hermite).
+
+    Like `np.interp`, times outside the data range evaluate to the first or
+    last sample.
+    """
+
+    def __init__(self, times, columns, order=1):
+        if order not in [1, 3]:
+            raise ValueError(f"Unsupported interpolation order {order}.")
+        self.times = np.array(times, dtype=float)
+        num_times = len(self.times)
+        self.shapes = {
+            name: np.shape(data)[1:] for name, data in columns.items()
+        }
+        flat_columns = [
+            np.asarray(data, dtype=float).reshape(num_times, -1)
+            for data in columns.values()
+        ]
+        self.data = (
+            np.concatenate(flat_columns, axis=1)
+            if len(flat_columns) > 0
+            else np.zeros((num_times, 0))
+        )
+        # Compute indices arithmetically if the data is sampled uniformly,
+        # else with a binary search
+        self.dt = None
+        if num_times > 1:
+            dt = np.diff(self.times)
+            if np.allclose(dt, dt[0]):
+                self.dt = dt[0]
+        self.derivatives = None
+        if order == 3 and num_times > 2:
+            self.derivatives = mode_derivatives(self.times, self.data)
+
+    def __call__(self, time):
+        """Interpolate the data to the `time`
+
+        The `time` is a number or an array. Returns a dictionary with arrays
+        of shape `np.shape(time) + shape`, where `shape` is the shape of a
+        single sample of the column.
+        """
+        time_shape = np.shape(time)
+        time = np.clip(
+            np.ravel(np.asarray(time, dtype=float)),
+            self.times[0],
+            self.times[-1],
+        )
+        if len(self.times) == 1:
+            values = np.repeat(self.data, len(time), axis=0)
+        else:
+            values = interpolate(
+                time,
+                self.times,
+                self.data,
+                dt=self.dt,
+                waveform_mode_derivatives=self.derivatives,
+            )
+        result = {}
+        offset = 0
+        for name, shape in self.shapes.items():
+            size = int(np.prod(shape))
+            result[name] = values[:, offset : offset + size].reshape(
+                time_shape + shape
+            )
+            offset += size
+        return result
@@ -0,0 +1,64 @@
+import hashlib
+import logging
+import os
+
+import numpy as np
+
+
+def waveform_digest(waveform_columns):
+    """Content hash of waveform data
+
+    The `waveform_columns` map column names to arrays, e.g. the "Time" and
+    "Y_l2_m2" columns of the `WaveformDataReader` output. The digest changes
+    whenever any of the data changes, so it identifies the waveform
+    independently of the file it was read from.
+    """
+    digest = hashlib.md5()
+    for name in sorted(waveform_columns):
+        digest.update(name.encode("utf-8"))
+        digest.update(np.ascontiguousarray(waveform_columns[name]).tobytes())
+    return digest.hexdigest()
+
+
+def volume_frame_file(cache_dir, frame_id):
+    """Path of the cache file for the volume data identified by `frame_id`
+
+    The `frame_id` is a dictionary that holds everything the volume data
+    depends on, e.g. the `waveform_digest`, the filter properties and the time.
+    """
+    frame_hash = hashlib.md5(
+        repr(sorted(frame_id.items())).encode("utf-8")
+    ).hexdigest()
+    return os.path.join(cache_dir, f"volume_frame_{frame_hash}.npz")
+
+
+def load_volume_frame(cache_dir, frame_id):
+    """Load cached volume data, or return `None` if it isn't cached
+
+    Returns a dictionary that maps array names to arrays.
+    """
+    logger = logging.getLogger(__name__)
+    frame_file = volume_frame_file(cache_dir, frame_id)
+    if not os.path.exists(frame_file):
+        logger.debug(f"No volume data file '{frame_file}' found.")
+        return None
+    logger.debug(f"Loading volume data from file '{frame_file}'...")
+    with np.load(frame_file) as volume_data:
+        return {name: volume_data[name] for name in volume_data.files}
+
+
+def save_volume_frame(cache_dir, frame_id, volume_data):
+    """Cache the `volume_data`, a dictionary that maps array names to arrays
+
+    The arrays are written to a compressed archive, because the volume data of
+    every frame is cached and the cache can grow large. The file is written
+    under a temporary name first and then moved in place, so concurrent render
+    processes never read an incomplete file.
+    """
+    logger = logging.getLogger(__name__)
+    frame_file = volume_frame_file(cache_dir, frame_id)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_frame_file = frame_file[: -len(".npz")] + f"_{os.getpid()}.tmp.npz"
+    np.savez_compressed(tmp_frame_file, **volume_data)
+    os.replace(tmp_frame_file, frame_file)
+    logger.debug(f"Volume data saved to file '{frame_file}'.")
@@ -0,0 +1,123 @@
+import bisect
+import re
+
+import numpy as np
+
+MODE_NAME_PATTERN = re.compile(r"Y_l(\d+)_m(-?\d+)")
+
+# Largest number of times that `resample_uniform` resamples the data to
+MAX_RESAMPLED_TIMES = 2**24
+
+
+def parse_mode_name(mode_name):
+    """Parse the (l, m) indices from a mode name like 'Y_l2_m-1'
+
+    A '.dat' suffix, as used by SpEC dataset names, is ignored.
+    """
+    match = MODE_NAME_PATTERN.fullmatch(mode_name.replace(".dat", ""))
+    if match is None:
+        raise ValueError(f"Not a waveform mode name: {mode_name}")
+    return int(match.group(1)), int(match.group(2))
+
+
+class DatasetColumn:
+    """Lazy view of one column of a 2D dataset, e.g. in an HDF5 file
+
+    Indexing reads only the requested elements, so a binary search over the
+    column (see `time_window`) reads only a few values from the file.
+    """
+
+    def __init__(self, dataset, column):
+        self.dataset = dataset
+        self.column = column
+
+    def __len__(self):
+        return len(self.dataset)
+
+    def __getitem__(self, index):
+        return self.dataset[index, self.column]
+
+
+def time_window(times, start, stop, stride=1):
+    """Slice of the sorted `times` that covers the interval [start, stop]
+
+    Finds the indices with a binary search. The slice includes the last time
+    before `start` and the first time after `stop`, so data in the slice can be
+    interpolated anywhere in the interval. The `times` can be any sequence,
+    like a `DatasetColumn`, so only part of a dataset has to be read from a
+    file.
+
+    The start of the slice is moved back to a multiple of the `stride`. Then
+    keeping every `stride`-th sample of the slice keeps the same samples as
+    keeping every `stride`-th sample of all `times`, no matter where the
+    interval starts.
+    """
+    start_index = max(0, bisect.bisect_right(times, start) - 1)
+    start_index -= start_index % stride
+    stop_index = min(len(times), bisect.bisect_left(times, stop) + 1)
+    return slice(start_index, stop_index)
+
+
+def resample_uniform(
+    times, columns, dt=None, order=1, max_num_times=MAX_RESAMPLED_TIMES
+):
+    """Resample waveform data onto uniformly spaced times
+
+    Arguments:
+      times: The sorted times at which the data is sampled, shape (num_times,).
+      columns: Dictionary of arrays with shape (num_times, ...), e.g. the real
+        and imaginary parts of each waveform mode.
+      dt: Spacing of the resampled times. Defaults to the smallest spacing of
+        the `times`, so no features of the data are lost.
+      order: Interpolation order, either 1 (linear) or 3 (cubic spline).
+      max_num_times: Raise a `ValueError` if the data would be resampled to
+        more times than this, e.g. because two times are very close together.
+        Pass a larger `dt` in that case.
+
+    Repeated times are dropped, keeping the first sample at each time.
+
+    Returns: The uniformly spaced times, which start at `times[0]` and don't
+      exceed `times[-1]`, and a dictionary with the resampled columns.
+    """
+    times = np.asarray(times)
+    unique_times, unique_indices = np.unique(times, return_index=True)
+    if len(unique_times) < len(times):
+        times = unique_times
+        columns = {
+            name: np.asarray(data)[unique_indices]
+            for name, data in columns.items()
+        }
+    if dt is None or dt <= 0.0:
+        dt = np.min(np.diff(times))
+    num_times = np.floor((times[-1] - times[0]) / dt + 1e-10) + 1
+    if num_times > max_num_times:
+        raise ValueError(
+            f"Resampling the waveform data with dt={dt:.2e} would take"
+            f" {num_times:.0f} times, more than the maximum of"
+            f" {max_num_times}. Choose a larger timestep."
+        )
+    num_times = int(num_times)
+    uniform_times = times[0] + dt * np.arange(num_times)
+    if order == 1:
+
+        def resample(data):
+            flat_data = data.reshape(len(times), -1)
+            return np.stack(
+                [
+                    np.interp(uniform_times, times, component)
+                    for component in flat_data.T
+                ],
+                axis=-1,
+            ).reshape((num_times,) + data.shape[1:])
+
+    elif order == 3:
+        from scipy.interpolate import CubicSpline
+
+        def resample(data):
+            return CubicSpline(times, data, axis=0)(uniform_times)
+
+    else:
+        raise ValueError(f"Unsupported interpolation order {order}.")
+    return uniform_times, {
+        name: resample(data) for name, data in columns.items()
+    }
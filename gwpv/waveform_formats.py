@@ -0,0 +1,173 @@
+import os
+
+import h5py
+import numpy as np
+
+from gwpv.waveform_data import DatasetColumn, time_window
+
+
+def mode_name(l, m):
+    return f"Y_l{l}_m{m}"
+
+
+def complex_to_columns(data):
+    """View complex mode data as two real columns without copying
+
+    The columns are the real and imaginary part, like in the SpEC format. Real
+    data with two columns is returned unchanged.
+    """
+    if not np.iscomplexobj(data):
+        return data
+    data = np.ascontiguousarray(data)
+    return data.view(data.real.dtype).reshape(len(data), 2)
+
+
+class SpecWaveformFile:
+    """SpEC waveform format with one dataset per mode
+
+    The modes are stored in datasets '{Subfile}/Y_l{l}_m{m}.dat' with the three
+    columns time, r * Re(h_lm) and r * Im(h_lm). See `WaveformDataReader` for
+    details. Reading the modes takes one dataset read per mode.
+    """
+
+    def __init__(self, filename, subfile):
+        self.filename = filename
+        self.subfile = subfile
+
+    @property
+    def mode_names(self):
+        with h5py.File(self.filename, "r") as f:
+            return [
+                dataset_name.replace(".dat", "")
+                for dataset_name in f[self.subfile].keys()
+                if dataset_name.startswith("Y_")
+            ]
+
+    def read(self, mode_names, time_range=None, time_stride=1):
+        with h5py.File(self.filename, "r") as f:
+            strain = f[self.subfile]
+            window = slice(None)
+            if time_range is not None:
+                window = time_window(
+                    DatasetColumn(strain["Y_l2_m2.dat"], 0),
+                    *time_range,
+                    stride=time_stride,
+                )
+            t = strain["Y_l2_m2.dat"][window, 0]
+            modes = {
+                mode_name: strain[mode_name + ".dat"][window, 1:]
+                for mode_name in mode_names
+            }
+        return t, modes
+
+
+class ContiguousWaveformFile:
+    """Waveform format with all modes in one contiguous 2D dataset
+
+    This is the layout of the `scri` and `sxs` waveform modes: the subfile
+    holds a 'time' dataset and a complex 'data' dataset with shape
+    (num_times, num_modes), and the attributes 'ell_min' and 'ell_max'. The
+    modes are ordered by l and then by m from -l to l. Reading the modes takes
+    a single contiguous read.
+    """
+
+    def __init__(self, filename, subfile):
+        self.filename = filename
+        self.subfile = subfile
+
+    @property
+    def mode_names(self):
+        with h5py.File(self.filename, "r") as f:
+            attrs = f[self.subfile].attrs
+            ell_min, ell_max = int(attrs["ell_min"]), int(attrs["ell_max"])
+        return [
+            mode_name(l, m)
+            for l in range(ell_min, ell_max + 1)
+            for m in range(-l, l + 1)
+        ]
+
+    def read(self, mode_names, time_range=None, time_stride=1):
+        mode_indices = {name: i for i, name in enumerate(self.mode_names)}
+        with h5py.File(self.filename, "r") as f:
+            strain = f[self.subfile]
+            window = slice(None)
+            if time_range is not None:
+                window = time_window(
+                    strain["time"], *time_range, stride=time_stride
+                )
+            t = strain["time"][window]
+            if len(mode_names) == 0:
+                return t, {}
+            data = strain["data"][window]
+        return t, {
+            mode_name: complex_to_columns(data[:, mode_indices[mode_name]])
+            for mode_name in mode_names
+        }
+
+
+class NumpyWaveformBundle:
+    """Waveform data stored as NumPy arrays
+
+    Either a '.npz' file or a directory of '.npy' files. Both hold a 'Time'
+    array and one array per mode named like 'Y_l2_m2', which is either complex
+    or has the two columns r * Re(h_lm) and r * Im(h_lm). The '.npy' files in a
+    directory are memory-mapped, so reading the modes is nearly free and
+    render processes on a node share the data in the page cache.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def _load(self, name):
+        if os.path.isdir(self.filename):
+            return np.load(
+                os.path.join(self.filename, name + ".npy"), mmap_mode="r"
+            )
+        with np.load(self.filename) as bundle:
+            return bundle[name]
+
+    @property
+    def mode_names(self):
+        if os.path.isdir(self.filename):
+            names = [
+                filename[: -len(".npy")]
+                for filename in sorted(os.listdir(self.filename))
+                if filename.endswith(".npy")
+            ]
+        else:
+            with np.load(self.filename) as bundle:
+                names = bundle.files
+        return [name for name in names if name.startswith("Y_")]
+
+    def read(self, mode_names, time_range=None, time_stride=1):
+        t = self._load("Time")
+        window = slice(None)
+        if time_range is not None:
+            window = time_window(t, *time_range, stride=time_stride)
+        return t[window], {
+            mode_name: complex_to_columns(self._load(mode_name)[window])
+            for mode_name in mode_names
+        }
+
+
+def is_numpy_bundle(filename):
+    return os.path.isdir(filename) or filename.endswith(".npz")
+
+
+def open_waveform_file(filename, subfile=None):
+    """Select the waveform format that can read the file
+
+    Returns an object with a `mode_names` property and a
+    `read(mode_names, time_range=None, time_stride=1)` method that returns the
+    times and a dictionary of the modes. The modes have two columns,
+    r * Re(h_lm) and r * Im(h_lm). See `waveform_data.time_window` for the
+    `time_range` and `time_stride`. The `subfile` is ignored for
+    `NumpyWaveformBundle`s.
+    """
+    if is_numpy_bundle(filename):
+        return NumpyWaveformBundle(filename)
+    with h5py.File(filename, "r") as f:
+        strain = f[subfile]
+        if "data" in strain and "time" in strain:
+            return ContiguousWaveformFile(filename, subfile)
+    return SpecWaveformFile(filename, subfile)
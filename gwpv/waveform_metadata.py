@@ -0,0 +1,112 @@
+import json
+import logging
+import os
+
+import numpy as np
+
+from gwpv.waveform_formats import is_numpy_bundle, open_waveform_file
+
+logger = logging.getLogger(__name__)
+
+# Metadata of the waveform files scanned by this process, keyed by file, subfile
+# and file modification
+_cached_metadata = {}
+
+
+def scan_waveform(filename, subfile):
+    """Collect metadata of the waveform data in a single pass over the file
+
+    The data can be in any format that `waveform_formats.open_waveform_file`
+    supports. Returns a dictionary with the following keys:
+
+    - 'StartTime' and 'EndTime': The time range of the data.
+    - 'NumTimes': The number of samples.
+    - 'UniformlySampled': Whether the samples are spaced uniformly in time.
+    - 'Timestep': The spacing of the samples if they are spaced uniformly,
+      otherwise `None`.
+    - 'Modes': The names of the mode datasets, e.g. 'Y_l2_m2'.
+    - 'MaxAmplitudes': The maximum amplitude |r h_lm| of each mode.
+    """
+    logger.info(f"Scanning waveform data in '{filename}:{subfile}'...")
+    waveform_file = open_waveform_file(filename, subfile)
+    mode_names = waveform_file.mode_names
+    t, modes = waveform_file.read(mode_names)
+    max_amplitudes = {
+        mode_name: float(np.max(np.hypot(mode_data[:, 0], mode_data[:, 1])))
+        for mode_name, mode_data in modes.items()
+    }
+    dt = np.diff(t)
+    uniformly_sampled = bool(np.allclose(dt, dt[0]))
+    return {
+        "StartTime": float(t[0]),
+        "EndTime": float(t[-1]),
+        "NumTimes": len(t),
+        "UniformlySampled": uniformly_sampled,
+        "Timestep": float(dt[0]) if uniformly_sampled else None,
+        "Modes": mode_names,
+        "MaxAmplitudes": max_amplitudes,
+    }
+
+
+def waveform_time_range(filename, subfile):
+    """Start and end time of the waveform data
+
+    Reads only the times, so this is much cheaper than scanning the waveform
+    (see `waveform_metadata`) when the peak amplitudes of the modes aren't
+    needed.
+    """
+    t, _ = open_waveform_file(filename, subfile).read([])
+    return float(t[0]), float(t[-1])
+
+
+def waveform_metadata(filename, subfile):
+    """Metadata of the waveform data, scanned only once
+
+    The metadata (see `scan_waveform`) is cached in memory and in a sidecar
+    file named '{filename}.metadata.json' next to the waveform file, so other
+    processes don't have to scan the file again. The cache is invalidated when
+    the waveform file is modified. If the sidecar file can't be written, e.g.
+    because the directory is read-only, only the in-memory cache is used.
+    """
+    # Strip trailing separators, so the sidecar file of a bundle directory is
+    # placed next to it and the cache is shared between spellings of the path
+    filename = os.path.normpath(filename)
+    if is_numpy_bundle(filename):
+        # Bundles have no subfiles, so share the metadata between all of them
+        subfile = ""
+    file_stat = os.stat(filename)
+    metadata_id = dict(
+        subfile=subfile,
+        mtime=file_stat.st_mtime,
+        size=file_stat.st_size,
+    )
+    memory_key = (os.path.abspath(filename), subfile)
+    if memory_key in _cached_metadata:
+        cached_id, metadata = _cached_metadata[memory_key]
+        if cached_id == metadata_id:
+            logger.debug("Using waveform metadata from memory.")
+            return metadata
+    sidecar_file = filename + ".metadata.json"
+    sidecar = {}
+    if os.path.exists(sidecar_file):
+        try:
+            with open(sidecar_file, "r") as open_sidecar_file:
+                sidecar = json.load(open_sidecar_file)
+        except (OSError, ValueError) as err:
+            logger.debug(f"Can't read metadata file '{sidecar_file}': {err}")
+    if sidecar.get(subfile, {}).get("Id") == metadata_id:
+        logger.debug(f"Using waveform metadata from file '{sidecar_file}'.")
+        metadata = sidecar[subfile]["Metadata"]
+    else:
+        metadata = scan_waveform(filename, subfile)
+        sidecar[subfile] = {"Id": metadata_id, "Metadata": metadata}
+        try:
+            tmp_sidecar_file = sidecar_file + f".{os.getpid()}.tmp"
+            with open(tmp_sidecar_file, "w") as open_sidecar_file:
+                json.dump(sidecar, open_sidecar_file, indent=2)
+            os.replace(tmp_sidecar_file, sidecar_file)
+            logger.debug(f"Waveform metadata saved to file '{sidecar_file}'.")
+        except OSError as err:
+            logger.debug(f"Can't write metadata file '{sidecar_file}': {err}")
+    _cached_metadata[memory_key] = (metadata_id, metadata)
+    return metadata
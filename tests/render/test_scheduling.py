@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from gwpv.render import scheduling
+
+
+class TestScheduling(unittest.TestCase):
+    def test_frame_chunks(self):
+        chunks = scheduling.frame_chunks((10, 110), num_jobs=4)
+        self.assertEqual(chunks[0], (10, 13))
+        self.assertEqual(chunks[-1], (109, 110))
+        self.assertEqual(
+            sum([list(range(*chunk)) for chunk in chunks], []),
+            list(range(10, 110)),
+        )
+        self.assertEqual(
+            scheduling.frame_chunks((0, 3), num_jobs=4),
+            [(0, 1), (1, 2), (2, 3)],
+        )
+        self.assertEqual(
+            scheduling.frame_chunks((0, 10), num_jobs=2, chunk_size=4),
+            [(0, 4), (4, 8), (8, 10)],
+        )
+
+    def test_frame_chunks_ordered_by_timings(self):
+        frame_timings = {frame_i: 1.0 for frame_i in range(10)}
+        frame_timings[5] = 10.0
+        # Frames 10 and 11 have no timings, so they take the average time
+        chunks = scheduling.frame_chunks(
+            (0, 12), num_jobs=2, chunk_size=4, frame_timings=frame_timings
+        )
+        self.assertEqual(chunks, [(4, 8), (8, 12), (0, 4)])
+
+    def test_save_frame_timings(self):
+        with tempfile.TemporaryDirectory() as frames_dir:
+            self.assertEqual(scheduling.load_frame_timings(frames_dir), {})
+            scheduling.save_frame_timings(frames_dir, {0: 1.5, 1: 2.0})
+            scheduling.save_frame_timings(frames_dir, {1: 3.0, 2: 0.5})
+            self.assertTrue(
+                os.path.exists(
+                    os.path.join(frames_dir, scheduling.FRAME_TIMINGS_FILE)
+                )
+            )
+            self.assertEqual(
+                scheduling.load_frame_timings(frames_dir),
+                {0: 1.5, 1: 3.0, 2: 0.5},
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+
+import h5py
+import numpy as np
+import numpy.testing as npt
+
+from gwpv import waveform_metadata
+from gwpv.prepare_waveform import prepare_waveform
+from gwpv.waveform_formats import open_waveform_file
+
+
+class TestPrepareWaveform(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp_dir.name, "Waveform.h5")
+        self.output_dir = os.path.join(self.tmp_dir.name, "Bundle")
+        t = np.concatenate([np.linspace(0.0, 10.0, 11), [10.5, 11.0]])
+        with h5py.File(self.filename, "w") as f:
+            strain = f.create_group("Extrapolated_N2.dir")
+            for l, m in [(2, 2), (2, 1), (3, 3)]:
+                strain[f"Y_l{l}_m{m}.dat"] = np.stack(
+                    [t, l * t, -m * t], axis=-1
+                )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_prepare_waveform(self):
+        metadata = prepare_waveform(
+            self.filename, "Extrapolated_N2.dir", self.output_dir, ell_max=2
+        )
+        self.assertTrue(metadata["UniformlySampled"])
+        self.assertAlmostEqual(metadata["Timestep"], 0.5)
+        self.assertEqual(metadata["NumTimes"], 23)
+        self.assertEqual(sorted(metadata["Modes"]), ["Y_l2_m1", "Y_l2_m2"])
+        self.assertAlmostEqual(
+            metadata["MaxAmplitudes"]["Y_l2_m2"], np.hypot(22.0, 22.0), 5
+        )
+        mode_data = np.load(
+            os.path.join(self.output_dir, "Y_l2_m1.npy"), mmap_mode="r"
+        )
+        self.assertEqual(mode_data.dtype, np.complex64)
+        self.assertTrue(mode_data.flags.c_contiguous)
+        t, modes = open_waveform_file(self.output_dir).read(["Y_l2_m1"])
+        npt.assert_allclose(t, np.linspace(0.0, 11.0, 23))
+        npt.assert_allclose(modes["Y_l2_m1"][:, 0], 2.0 * t, rtol=1e-6)
+        npt.assert_allclose(modes["Y_l2_m1"][:, 1], -t, rtol=1e-6)
+        # Readers share the metadata regardless of the subfile
+        waveform_metadata._cached_metadata.clear()
+        self.assertEqual(
+            waveform_metadata.waveform_metadata(
+                self.output_dir, "Extrapolated_N2.dir"
+            ),
+            metadata,
+        )
+
+    def test_output_dir_not_empty(self):
+        os.makedirs(self.output_dir)
+        data_file = os.path.join(self.output_dir, "Data.txt")
+        open(data_file, "w").close()
+        for force in [False, True]:
+            with self.assertRaises(ValueError):
+                prepare_waveform(
+                    self.filename,
+                    "Extrapolated_N2.dir",
+                    self.output_dir,
+                    force=force,
+                )
+        self.assertTrue(os.path.exists(data_file))
+
+    def test_replace_bundle(self):
+        prepare_waveform(self.filename, "Extrapolated_N2.dir", self.output_dir)
+        with self.assertRaises(ValueError):
+            prepare_waveform(
+                self.filename, "Extrapolated_N2.dir", self.output_dir
+            )
+        metadata = prepare_waveform(
+            self.filename,
+            "Extrapolated_N2.dir",
+            self.output_dir,
+            ell_max=2,
+            force=True,
+        )
+        self.assertEqual(sorted(metadata["Modes"]), ["Y_l2_m1", "Y_l2_m2"])
+        self.assertFalse(
+            os.path.exists(os.path.join(self.output_dir, "Y_l3_m3.npy"))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
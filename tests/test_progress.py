@@ -0,0 +1,40 @@
+import unittest
+
+from rich.progress import Progress
+
+from gwpv.progress import update_progress
+
+
+class TestProgress(unittest.TestCase):
+    def test_update_progress(self):
+        progress = Progress(disable=True)
+        task_id = progress.add_task("Rendering", start=False)
+        frame_timings = {}
+        for progress_update in [
+            dict(total=2),
+            dict(start=True),
+            dict(advance=1, frame=3, frame_time=1.5),
+            dict(advance=1, frame=4, frame_time=2.5),
+        ]:
+            update_progress(progress, task_id, progress_update, frame_timings)
+        self.assertTrue(progress.finished)
+        self.assertEqual(frame_timings, {3: 1.5, 4: 2.5})
+
+    def test_update_progress_freeze_time(self):
+        # Rendering a scene with 'FreezeTime' reports a single completed frame
+        # without timing
+        progress = Progress(disable=True)
+        task_id = progress.add_task("Rendering", start=False)
+        frame_timings = {}
+        for progress_update in [
+            dict(total=1),
+            dict(start=True),
+            dict(completed=1),
+        ]:
+            update_progress(progress, task_id, progress_update, frame_timings)
+        self.assertTrue(progress.finished)
+        self.assertEqual(frame_timings, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,370 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from gwpv import strain_volume, waveform_data
+
+
+class TestStrainVolume(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(seed=0)
+        self.num_points = 1000
+        self.waveform_times = np.sort(rng.uniform(-10.0, 10.0, 50))
+        self.waveform_modes = rng.normal(size=(50, 3)) + 1j * rng.normal(
+            size=(50, 3)
+        )
+        # Include points outside the waveform time range and on its boundaries
+        self.phase = np.concatenate(
+            [
+                rng.uniform(-12.0, 12.0, self.num_points - 2),
+                self.waveform_times[[0, -1]],
+            ]
+        )
+        self.swsh_grid = rng.normal(
+            size=(self.num_points, 5)
+        ) + 1j * rng.normal(size=(self.num_points, 5))
+        self.swsh_indices = np.array([4, 1, 1])
+        self.radial_weight = rng.uniform(size=self.num_points)
+
+    def expected_mode(self, i):
+        return (
+            np.interp(
+                self.phase,
+                self.waveform_times,
+                self.waveform_modes[:, i],
+                left=0.0,
+                right=0.0,
+            )
+            * self.swsh_grid[:, self.swsh_indices[i]]
+            * self.radial_weight
+        )
+
+    def test_interpolation_stencil(self):
+        index, lower_weight, upper_weight = strain_volume.interpolation_stencil(
+            self.phase, self.waveform_times
+        )
+        np.testing.assert_allclose(
+            lower_weight * self.waveform_modes[index, 0]
+            + upper_weight * self.waveform_modes[index + 1, 0],
+            np.interp(
+                self.phase,
+                self.waveform_times,
+                self.waveform_modes[:, 0],
+                left=0.0,
+                right=0.0,
+            ),
+        )
+
+    def test_interpolation_stencil_lookup(self):
+        expected_stencil = strain_volume.interpolation_stencil(
+            self.phase, self.waveform_times
+        )
+        table = strain_volume.search_table(self.waveform_times)
+        self.assertIsNotNone(table)
+        stencil = strain_volume.interpolation_stencil(
+            self.phase, self.waveform_times, search_table=table
+        )
+        np.testing.assert_array_equal(stencil[0], expected_stencil[0])
+        np.testing.assert_allclose(stencil[1], expected_stencil[1])
+        np.testing.assert_allclose(stencil[2], expected_stencil[2])
+        self.assertIsNone(
+            strain_volume.search_table(self.waveform_times, max_size=10)
+        )
+        # Repeated times fall back to a binary search
+        repeated_times = np.array([0.0, 1.0, 1.0, 2.5, 3.0])
+        self.assertIsNone(strain_volume.search_table(repeated_times))
+        index, lower_weight, upper_weight = strain_volume.interpolation_stencil(
+            np.array([0.5, 2.0]), repeated_times
+        )
+        np.testing.assert_allclose(
+            lower_weight * repeated_times[index]
+            + upper_weight * repeated_times[index + 1],
+            [0.5, 2.0],
+        )
+        # Uniformly sampled times
+        waveform_times = np.linspace(-10.0, 10.0, 50)
+        dt = waveform_times[1] - waveform_times[0]
+        index, lower_weight, upper_weight = strain_volume.interpolation_stencil(
+            self.phase, waveform_times, dt=dt
+        )
+        np.testing.assert_allclose(
+            lower_weight * self.waveform_modes[index, 0]
+            + upper_weight * self.waveform_modes[index + 1, 0],
+            np.interp(
+                self.phase,
+                waveform_times,
+                self.waveform_modes[:, 0],
+                left=0.0,
+                right=0.0,
+            ),
+        )
+
+    def test_interpolation_stencil_jittered_times(self):
+        # Times that pass as uniformly sampled but are slightly jittered, e.g.
+        # by round-off in the file, must still bracket each phase
+        rng = np.random.default_rng(seed=1)
+        dt = 0.1
+        waveform_times = np.arange(100) * dt + rng.uniform(-1e-9, 1e-9, 100)
+        phase = np.concatenate(
+            [
+                waveform_times[1:-1],
+                waveform_times[1:-1] - 1e-12,
+                rng.uniform(waveform_times[0], waveform_times[-1], 1000),
+            ]
+        )
+        index, lower_weight, upper_weight = strain_volume.interpolation_stencil(
+            phase, waveform_times, dt=dt
+        )
+        self.assertTrue(np.all(waveform_times[index] <= phase))
+        self.assertTrue(np.all(phase < waveform_times[index + 1]))
+        waveform_mode = np.sin(waveform_times)
+        np.testing.assert_allclose(
+            lower_weight * waveform_mode[index]
+            + upper_weight * waveform_mode[index + 1],
+            np.interp(phase, waveform_times, waveform_mode),
+            atol=1e-7,
+        )
+
+    def test_hermite_interpolation(self):
+        # Cubic Hermite interpolation is exact for cubic polynomials
+        waveform_modes = np.stack(
+            [self.waveform_times**3, 1j * self.waveform_times**2], axis=-1
+        )
+        waveform_mode_derivatives = np.stack(
+            [3.0 * self.waveform_times**2, 2j * self.waveform_times], axis=-1
+        )
+        inside = (self.phase >= self.waveform_times[0]) & (
+            self.phase <= self.waveform_times[-1]
+        )
+        expected = np.where(
+            inside[:, np.newaxis],
+            np.stack([self.phase**3, 1j * self.phase**2], axis=-1),
+            0.0,
+        )
+        for lookup_kwargs in (
+            dict(),
+            dict(search_table=strain_volume.search_table(self.waveform_times)),
+        ):
+            np.testing.assert_allclose(
+                strain_volume.interpolate(
+                    self.phase,
+                    self.waveform_times,
+                    waveform_modes,
+                    waveform_mode_derivatives=waveform_mode_derivatives,
+                    **lookup_kwargs,
+                ),
+                expected,
+                atol=1e-10,
+            )
+        # Finite-difference derivatives are exact for quadratic polynomials
+        np.testing.assert_allclose(
+            strain_volume.mode_derivatives(
+                self.waveform_times, waveform_modes[:, 1:]
+            )[1:-1],
+            waveform_mode_derivatives[1:-1, 1:],
+        )
+
+    def test_compute_strain(self):
+        strain, strain_modes = strain_volume.compute_strain(
+            self.phase,
+            self.waveform_times,
+            self.waveform_modes,
+            self.swsh_grid,
+            self.swsh_indices,
+            radial_weight=self.radial_weight,
+            mode_offsets=[0, 1],
+            chunk_size=300,
+        )
+        expected_modes = [self.expected_mode(i) for i in range(3)]
+        np.testing.assert_allclose(strain_modes[:, 0], expected_modes[0])
+        np.testing.assert_allclose(
+            strain_modes[:, 1], expected_modes[1] + expected_modes[2]
+        )
+        np.testing.assert_allclose(strain, sum(expected_modes))
+        np.testing.assert_allclose(
+            strain_volume.compute_strain(
+                self.phase,
+                self.waveform_times,
+                self.waveform_modes,
+                self.swsh_grid,
+                self.swsh_indices,
+                radial_weight=self.radial_weight,
+            ),
+            strain,
+        )
+
+    def test_num_threads(self):
+        kwargs = dict(
+            phase=self.phase,
+            waveform_times=self.waveform_times,
+            waveform_modes=self.waveform_modes,
+            swsh_grid=self.swsh_grid,
+            swsh_indices=self.swsh_indices,
+            radial_weight=self.radial_weight,
+            mode_offsets=[0, 1],
+            chunk_size=64,
+        )
+        strain, strain_modes = strain_volume.compute_strain(**kwargs)
+        threaded_strain, threaded_strain_modes = strain_volume.compute_strain(
+            **kwargs, num_threads=4
+        )
+        np.testing.assert_array_equal(threaded_strain, strain)
+        np.testing.assert_array_equal(threaded_strain_modes, strain_modes)
+
+    def test_points(self):
+        kwargs = dict(
+            phase=self.phase,
+            waveform_times=self.waveform_times,
+            waveform_modes=self.waveform_modes,
+            swsh_grid=self.swsh_grid,
+            swsh_indices=self.swsh_indices,
+            radial_weight=self.radial_weight,
+            mode_offsets=[0, 1],
+            chunk_size=64,
+        )
+        strain, strain_modes = strain_volume.compute_strain(**kwargs)
+        points = np.flatnonzero(
+            (self.phase >= self.waveform_times[0])
+            & (self.phase <= self.waveform_times[-1])
+        )
+        self.assertLess(len(points), self.num_points)
+        sparse_strain, sparse_strain_modes = strain_volume.compute_strain(
+            **kwargs, points=points
+        )
+        np.testing.assert_allclose(sparse_strain, strain)
+        np.testing.assert_allclose(sparse_strain_modes, strain_modes)
+
+    def test_radial_shells(self):
+        shell_phase = np.linspace(-12.0, 12.0, 20)
+        shell_index = np.arange(self.num_points) % 20
+        self.phase = shell_phase[shell_index]
+        strain = strain_volume.compute_strain(
+            shell_phase,
+            self.waveform_times,
+            self.waveform_modes,
+            self.swsh_grid,
+            self.swsh_indices,
+            radial_weight=self.radial_weight,
+            shell_index=shell_index,
+            chunk_size=300,
+        )
+        np.testing.assert_allclose(
+            strain, sum(self.expected_mode(i) for i in range(3))
+        )
+
+    def test_single_precision(self):
+        strain = strain_volume.compute_strain(
+            self.phase.astype(np.float32),
+            self.waveform_times,
+            self.waveform_modes.astype(np.complex64),
+            self.swsh_grid.astype(np.complex64),
+            self.swsh_indices,
+            radial_weight=self.radial_weight.astype(np.float32),
+        )
+        self.assertEqual(strain.dtype, np.complex64)
+        np.testing.assert_allclose(
+            strain, sum(self.expected_mode(i) for i in range(3)), atol=1e-4
+        )
+
+    def test_compute_strain_batch(self):
+        times = np.linspace(-2.0, 2.0, 7)
+        retarded_time = self.phase
+        shell_retarded_time = np.linspace(-12.0, 12.0, 20)
+        shell_index = np.arange(self.num_points) % 20
+        points = np.arange(0, self.num_points, 3)
+        kwargs = dict(
+            waveform_times=self.waveform_times,
+            waveform_modes=self.waveform_modes,
+            swsh_grid=self.swsh_grid,
+            swsh_indices=self.swsh_indices,
+            radial_weight=self.radial_weight,
+        )
+        for batch_kwargs, retarded_time in (
+            (dict(), retarded_time),
+            (dict(points=points), retarded_time),
+            (dict(shell_index=shell_index), shell_retarded_time),
+        ):
+            expected_strain = [
+                strain_volume.compute_strain(
+                    t - retarded_time, **kwargs, **batch_kwargs
+                )
+                for t in times
+            ]
+            strain = strain_volume.compute_strain_batch(
+                times, retarded_time, **kwargs, **batch_kwargs, chunk_size=100
+            )
+            self.assertEqual(strain.shape, (len(times), self.num_points))
+            np.testing.assert_allclose(strain, expected_strain)
+            threaded_strain = strain_volume.compute_strain_batch(
+                times,
+                retarded_time,
+                **kwargs,
+                **batch_kwargs,
+                chunk_size=100,
+                num_threads=4,
+            )
+            np.testing.assert_array_equal(threaded_strain, strain)
+
+    def test_compute_strain_batch_restricted_waveform(self):
+        # Computing each frame with the waveform restricted to the phases of
+        # the frame, like `WaveformToVolume.RequestData` does, must give the
+        # same strain as computing all frames in one batch, like
+        # `WaveformToVolume.compute_volume_data` does. Frames near the end of
+        # the data have phases between the last samples of the window, so the
+        # window must include the first sample after the phases.
+        waveform_times = np.linspace(-10.0, 10.0, 41)
+        dt = waveform_times[1] - waveform_times[0]
+        kwargs = dict(
+            waveform_modes=self.waveform_modes[:41],
+            swsh_grid=self.swsh_grid,
+            swsh_indices=self.swsh_indices,
+            radial_weight=self.radial_weight,
+            dt=dt,
+        )
+        retarded_time = np.linspace(-1.23, 0.77, self.num_points)
+        times = np.array([-8.9, 0.1, 9.0, 9.4, 10.2])
+        strain = strain_volume.compute_strain_batch(
+            times, retarded_time, waveform_times=waveform_times, **kwargs
+        )
+        for t, frame_strain in zip(times, strain):
+            phase = t - retarded_time
+            window = waveform_data.time_window(
+                waveform_times, np.min(phase), np.max(phase)
+            )
+            expected_strain = strain_volume.compute_strain(
+                phase,
+                waveform_times=waveform_times[window],
+                **dict(kwargs, waveform_modes=kwargs["waveform_modes"][window]),
+            )
+            np.testing.assert_allclose(frame_strain, expected_strain)
+
+    def test_compute_strain_batch_output_file(self):
+        times = np.linspace(-2.0, 2.0, 7)
+        kwargs = dict(
+            waveform_times=self.waveform_times,
+            waveform_modes=self.waveform_modes,
+            swsh_grid=self.swsh_grid,
+            swsh_indices=self.swsh_indices,
+            radial_weight=self.radial_weight,
+        )
+        strain = strain_volume.compute_strain_batch(times, self.phase, **kwargs)
+        with tempfile.TemporaryDirectory() as output_dir:
+            output_file = os.path.join(output_dir, "strain.npy")
+            out = np.lib.format.open_memmap(
+                output_file,
+                mode="w+",
+                dtype=strain.dtype,
+                shape=strain.shape,
+            )
+            strain_volume.compute_strain_batch(
+                times, self.phase, **kwargs, out=out
+            )
+            out.flush()
+            del out
+            np.testing.assert_array_equal(np.load(output_file), strain)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from gwpv import swsh_cache
+
+
+class TestSwshCache(unittest.TestCase):
+    def setUp(self):
+        self.grid_kwargs = dict(
+            size=10.0,
+            num_points=6,
+            spin_weight=-2,
+            ell_max=3,
+            clip_y_normal=False,
+            clip_z_normal=False,
+        )
+
+    def test_mmap(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            swsh_grid, r = swsh_cache.cached_swsh_grid(
+                **self.grid_kwargs, cache_dir=cache_dir
+            )
+            self.assertEqual(swsh_grid.shape, (6**3, 16))
+            self.assertEqual(r.shape, (6**3,))
+            mapped_swsh_grid, mapped_r = swsh_cache.cached_swsh_grid(
+                **self.grid_kwargs, cache_dir=cache_dir, mmap=True
+            )
+            self.assertIsInstance(mapped_swsh_grid, np.memmap)
+            self.assertFalse(mapped_swsh_grid.flags.writeable)
+            np.testing.assert_array_equal(mapped_swsh_grid, swsh_grid)
+            np.testing.assert_array_equal(mapped_r, r)
+
+    def test_reflection_symmetry(self):
+        for num_points in (6, 7):
+            for clip_y_normal in (False, True):
+                self.grid_kwargs.update(
+                    num_points=num_points, clip_y_normal=clip_y_normal
+                )
+                swsh_grid, r = swsh_cache.cached_swsh_grid(**self.grid_kwargs)
+                with tempfile.TemporaryDirectory() as cache_dir:
+                    for _ in range(2):
+                        symmetric_swsh_grid, symmetric_r = (
+                            swsh_cache.cached_swsh_grid(
+                                **self.grid_kwargs,
+                                cache_dir=cache_dir,
+                                reflection_symmetry=True,
+                            )
+                        )
+                        np.testing.assert_allclose(
+                            symmetric_swsh_grid, swsh_grid, atol=1e-14
+                        )
+                        np.testing.assert_array_equal(symmetric_r, r)
+
+    def test_angular_resolution(self):
+        swsh_grid, r = swsh_cache.cached_swsh_grid(**self.grid_kwargs)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for _ in range(2):
+                interpolated_swsh_grid, interpolated_r = (
+                    swsh_cache.cached_swsh_grid(
+                        **self.grid_kwargs,
+                        cache_dir=cache_dir,
+                        angular_resolution=400,
+                    )
+                )
+                self.assertEqual(interpolated_swsh_grid.shape, swsh_grid.shape)
+                np.testing.assert_array_equal(interpolated_r, r)
+                np.testing.assert_allclose(
+                    interpolated_swsh_grid[:, 8], swsh_grid[:, 8], atol=1e-4
+                )
+                modes = np.array([4, 8, 15])
+                np.testing.assert_allclose(
+                    interpolated_swsh_grid[:, modes],
+                    swsh_grid[:, modes],
+                    atol=1e-4,
+                )
+                np.testing.assert_allclose(
+                    interpolated_swsh_grid[10:20, modes],
+                    swsh_grid[10:20, modes],
+                    atol=1e-4,
+                )
+
+    def test_single_precision(self):
+        swsh_grid, r = swsh_cache.cached_swsh_grid(**self.grid_kwargs)
+        for extra_kwargs in (
+            {},
+            dict(reflection_symmetry=True),
+            dict(angular_resolution=400),
+        ):
+            with tempfile.TemporaryDirectory() as cache_dir:
+                single_swsh_grid, _ = swsh_cache.cached_swsh_grid(
+                    **self.grid_kwargs,
+                    **extra_kwargs,
+                    cache_dir=cache_dir,
+                    dtype=swsh_cache.complex_dtype("Single"),
+                )
+                self.assertEqual(single_swsh_grid.dtype, np.complex64)
+                self.assertEqual(single_swsh_grid[:, 4].dtype, np.complex64)
+                np.testing.assert_allclose(
+                    single_swsh_grid[:, 4], swsh_grid[:, 4], atol=1e-4
+                )
+
+    def test_radial_shells(self):
+        _, r = swsh_cache.cached_swsh_grid(**self.grid_kwargs)
+        spacing = 2.0 * self.grid_kwargs["size"] / 5
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for _ in range(2):
+                shell_radii, shell_index = swsh_cache.cached_radial_shells(
+                    size=self.grid_kwargs["size"],
+                    num_points=self.grid_kwargs["num_points"],
+                    clip_y_normal=False,
+                    clip_z_normal=False,
+                    shell_width=0.01,
+                    cache_dir=cache_dir,
+                )
+                self.assertLess(len(shell_radii), len(r) / 10)
+                np.testing.assert_allclose(
+                    shell_radii[shell_index], r, atol=0.005 * spacing
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
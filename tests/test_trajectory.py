@@ -0,0 +1,63 @@
+import unittest
+
+import numpy as np
+import numpy.testing as npt
+
+from gwpv.trajectory import TrajectoryInterpolant
+
+
+class TestTrajectoryInterpolant(unittest.TestCase):
+    def setUp(self):
+        self.times = np.linspace(0.0, 10.0, 101)
+        self.nonuniform_times = np.sort(
+            np.concatenate([self.times, [0.05, 4.321, 9.999]])
+        )
+
+    def columns(self, times):
+        return {
+            "Points": np.stack(
+                [np.cos(times), np.sin(times), 0.1 * times], axis=-1
+            ),
+            "Mass": 1.0 + 0.01 * times,
+            "Spin": np.stack([times, times**2], axis=-1)[:, np.newaxis, :],
+        }
+
+    def test_linear(self):
+        for times in [self.times, self.nonuniform_times]:
+            columns = self.columns(times)
+            interpolant = TrajectoryInterpolant(times, columns)
+            self.assertEqual(interpolant.dt is None, times is not self.times)
+            sample_times = np.array([-1.0, 0.0, 0.123, 4.5678, 10.0, 12.0])
+            values = interpolant(sample_times)
+            for name, data in columns.items():
+                flat_data = data.reshape(len(times), -1)
+                expected = np.stack(
+                    [
+                        np.interp(sample_times, times, component)
+                        for component in flat_data.T
+                    ],
+                    axis=-1,
+                ).reshape((len(sample_times),) + data.shape[1:])
+                npt.assert_allclose(values[name], expected, atol=1e-12)
+            single_value = interpolant(4.5678)
+            self.assertEqual(single_value["Points"].shape, (3,))
+            self.assertEqual(single_value["Mass"].shape, ())
+            npt.assert_allclose(single_value["Spin"], values["Spin"][3])
+
+    def test_cubic(self):
+        columns = self.columns(self.times)
+        interpolant = TrajectoryInterpolant(self.times, columns, order=3)
+        sample_times = np.linspace(0.5, 9.5, 17)
+        values = interpolant(sample_times)
+        npt.assert_allclose(
+            values["Points"][:, 0], np.cos(sample_times), atol=5e-5
+        )
+        npt.assert_allclose(
+            values["Spin"][:, 0, 1], sample_times**2, atol=1e-10
+        )
+        with self.assertRaises(ValueError):
+            TrajectoryInterpolant(self.times, columns, order=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
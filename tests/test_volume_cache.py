@@ -0,0 +1,50 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from gwpv import volume_cache
+
+
+class TestVolumeCache(unittest.TestCase):
+    def test_waveform_digest(self):
+        waveform_columns = {
+            "Time": np.linspace(0.0, 1.0, 10),
+            "Y_l2_m2": np.ones((10, 2)),
+        }
+        digest = volume_cache.waveform_digest(waveform_columns)
+        self.assertEqual(
+            volume_cache.waveform_digest(dict(waveform_columns)), digest
+        )
+        waveform_columns["Y_l2_m2"][3, 1] = 2.0
+        self.assertNotEqual(
+            volume_cache.waveform_digest(waveform_columns), digest
+        )
+
+    def test_volume_frame(self):
+        frame_id = dict(waveform="abc", time=1.5, size=100)
+        volume_data = {
+            "Plus strain": np.linspace(0.0, 1.0, 8),
+            "Cross strain": np.linspace(1.0, 2.0, 8).astype(np.float32),
+        }
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.assertIsNone(
+                volume_cache.load_volume_frame(cache_dir, frame_id)
+            )
+            volume_cache.save_volume_frame(cache_dir, frame_id, volume_data)
+            self.assertIsNone(
+                volume_cache.load_volume_frame(
+                    cache_dir, dict(frame_id, time=2.0)
+                )
+            )
+            loaded_volume_data = volume_cache.load_volume_frame(
+                cache_dir, frame_id
+            )
+            self.assertEqual(list(loaded_volume_data), list(volume_data))
+            for name, data in volume_data.items():
+                self.assertEqual(loaded_volume_data[name].dtype, data.dtype)
+                np.testing.assert_array_equal(loaded_volume_data[name], data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+
+import numpy as np
+
+from gwpv import waveform_data
+
+
+class TestWaveformData(unittest.TestCase):
+    def test_parse_mode_name(self):
+        self.assertEqual(waveform_data.parse_mode_name("Y_l2_m2"), (2, 2))
+        self.assertEqual(waveform_data.parse_mode_name("Y_l3_m-1.dat"), (3, -1))
+        with self.assertRaises(ValueError):
+            waveform_data.parse_mode_name("Time")
+
+    def test_time_window(self):
+        times = np.linspace(0.0, 10.0, 101)
+        data = np.stack([times, np.sin(times)], axis=-1)
+        for lazy_times in (times, waveform_data.DatasetColumn(data, 0)):
+            self.assertEqual(
+                waveform_data.time_window(lazy_times, 2.05, 3.0), slice(20, 31)
+            )
+            self.assertEqual(
+                waveform_data.time_window(lazy_times, 2.0, 2.95), slice(20, 31)
+            )
+            self.assertEqual(
+                waveform_data.time_window(lazy_times, -5.0, 50.0),
+                slice(0, 101),
+            )
+
+    def test_time_window_stride(self):
+        times = np.linspace(0.0, 10.0, 101)
+        for stride in (1, 2, 3, 7):
+            for start, stop in ((2.05, 3.0), (0.0, 1.0), (4.44, 9.9)):
+                window = waveform_data.time_window(
+                    times, start, stop, stride=stride
+                )
+                self.assertEqual(window.start % stride, 0)
+                cropped_times = times[window][::stride]
+                # Cropping at an offset keeps the same samples as cropping the
+                # uncropped strided samples
+                all_times = times[::stride]
+                np.testing.assert_array_equal(
+                    cropped_times,
+                    all_times[
+                        (all_times >= cropped_times[0])
+                        & (all_times <= cropped_times[-1])
+                    ],
+                )
+                self.assertLessEqual(cropped_times[0], start)
+                self.assertGreaterEqual(times[window][-1], min(stop, times[-1]))
+
+    def test_resample_uniform(self):
+        times = np.concatenate(
+            [np.linspace(0.0, 10.0, 11), np.linspace(10.5, 20.0, 20)]
+        )
+        columns = {
+            "Y_l2_m2": np.stack([times**2, -times], axis=-1),
+            "Y_l2_m1": np.stack([times**3, times**2], axis=-1),
+        }
+        uniform_times, resampled_columns = waveform_data.resample_uniform(
+            times, columns
+        )
+        np.testing.assert_allclose(uniform_times, np.linspace(0.0, 20.0, 41))
+        self.assertEqual(list(resampled_columns), list(columns))
+        for name, data in resampled_columns.items():
+            self.assertEqual(data.shape, (41, 2))
+            for component in range(2):
+                np.testing.assert_allclose(
+                    data[:, component],
+                    np.interp(
+                        uniform_times, times, columns[name][:, component]
+                    ),
+                )
+        uniform_times, resampled_columns = waveform_data.resample_uniform(
+            times, columns, dt=0.3, order=3
+        )
+        self.assertAlmostEqual(uniform_times[1] - uniform_times[0], 0.3)
+        self.assertLessEqual(uniform_times[-1], times[-1])
+        self.assertGreater(uniform_times[-1] + 0.3, times[-1])
+        # Cubic splines with not-a-knot end conditions are exact for cubics
+        np.testing.assert_allclose(
+            resampled_columns["Y_l2_m1"],
+            np.stack([uniform_times**3, uniform_times**2], axis=-1),
+            atol=1e-8,
+        )
+
+    def test_resample_uniform_repeated_times(self):
+        times = np.array([0.0, 1.0, 1.0, 2.5, 3.0])
+        columns = {"Y_l2_m2": np.stack([times, 2.0 * times], axis=-1)}
+        for order in [1, 3]:
+            uniform_times, resampled_columns = waveform_data.resample_uniform(
+                times, columns, order=order
+            )
+            np.testing.assert_allclose(uniform_times, np.linspace(0.0, 3.0, 7))
+            np.testing.assert_allclose(
+                resampled_columns["Y_l2_m2"],
+                np.stack([uniform_times, 2.0 * uniform_times], axis=-1),
+                atol=1e-12,
+            )
+
+    def test_resample_uniform_too_many_times(self):
+        times = np.array([0.0, 1.0, 1.0 + 1e-9, 2.0, 3.0])
+        columns = {"Y_l2_m2": np.stack([times, 2.0 * times], axis=-1)}
+        with self.assertRaisesRegex(ValueError, "Choose a larger timestep"):
+            waveform_data.resample_uniform(times, columns)
+        uniform_times, _ = waveform_data.resample_uniform(
+            times, columns, dt=0.5
+        )
+        self.assertEqual(len(uniform_times), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
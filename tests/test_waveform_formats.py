@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+
+import h5py
+import numpy as np
+
+from gwpv import waveform_formats
+
+
+class TestWaveformFormats(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(seed=0)
+        self.times = np.linspace(-10.0, 30.0, 81)
+        self.mode_names = [
+            waveform_formats.mode_name(l, m)
+            for l in range(2, 4)
+            for m in range(-l, l + 1)
+        ]
+        self.data = rng.normal(
+            size=(len(self.times), len(self.mode_names))
+        ) + 1j * rng.normal(size=(len(self.times), len(self.mode_names)))
+        # SpEC format
+        self.spec_file = os.path.join(self.tmp_dir.name, "Spec.h5")
+        with h5py.File(self.spec_file, "w") as f:
+            strain = f.create_group("Extrapolated_N2.dir")
+            for i, mode_name in enumerate(self.mode_names):
+                strain[mode_name + ".dat"] = np.stack(
+                    [self.times, self.data[:, i].real, self.data[:, i].imag],
+                    axis=-1,
+                )
+        # Contiguous format
+        self.contiguous_file = os.path.join(self.tmp_dir.name, "Contiguous.h5")
+        with h5py.File(self.contiguous_file, "w") as f:
+            strain = f.create_group("Extrapolated_N2.dir")
+            strain["time"] = self.times
+            strain["data"] = self.data
+            strain.attrs["ell_min"] = 2
+            strain.attrs["ell_max"] = 3
+        # NumPy bundles
+        arrays = dict(zip(self.mode_names, self.data.T), Time=self.times)
+        self.npz_file = os.path.join(self.tmp_dir.name, "Waveform.npz")
+        np.savez(self.npz_file, **arrays)
+        self.npy_dir = os.path.join(self.tmp_dir.name, "Waveform")
+        os.makedirs(self.npy_dir)
+        for name, array in arrays.items():
+            np.save(os.path.join(self.npy_dir, name + ".npy"), array)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_formats(self):
+        for filename, expected_format in (
+            (self.spec_file, waveform_formats.SpecWaveformFile),
+            (self.contiguous_file, waveform_formats.ContiguousWaveformFile),
+            (self.npz_file, waveform_formats.NumpyWaveformBundle),
+            (self.npy_dir, waveform_formats.NumpyWaveformBundle),
+        ):
+            waveform_file = waveform_formats.open_waveform_file(
+                filename, "Extrapolated_N2.dir"
+            )
+            self.assertIsInstance(waveform_file, expected_format)
+            self.assertEqual(
+                sorted(waveform_file.mode_names), sorted(self.mode_names)
+            )
+            t, modes = waveform_file.read(["Y_l2_m2", "Y_l3_m-1"])
+            np.testing.assert_array_equal(t, self.times)
+            self.assertEqual(list(modes), ["Y_l2_m2", "Y_l3_m-1"])
+            for mode_name, mode_data in modes.items():
+                expected = self.data[:, self.mode_names.index(mode_name)]
+                self.assertEqual(mode_data.shape, (len(self.times), 2))
+                np.testing.assert_array_equal(mode_data[:, 0], expected.real)
+                np.testing.assert_array_equal(mode_data[:, 1], expected.imag)
+            t, modes = waveform_file.read(["Y_l2_m2"], time_range=(0.1, 1.0))
+            np.testing.assert_array_equal(t, self.times[20:23])
+            np.testing.assert_array_equal(
+                modes["Y_l2_m2"][:, 0],
+                self.data[20:23, self.mode_names.index("Y_l2_m2")].real,
+            )
+            t, modes = waveform_file.read(
+                ["Y_l2_m2"], time_range=(0.1, 1.0), time_stride=3
+            )
+            np.testing.assert_array_equal(t[::3], self.times[18:23:3])
+            np.testing.assert_array_equal(
+                modes["Y_l2_m2"][::3, 0],
+                self.data[18:23:3, self.mode_names.index("Y_l2_m2")].real,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+import h5py
+import numpy as np
+
+from gwpv import waveform_metadata
+
+
+class TestWaveformMetadata(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp_dir.name, "Waveform.h5")
+        t = np.linspace(-10.0, 30.0, 81)
+        with h5py.File(self.filename, "w") as f:
+            strain = f.create_group("Extrapolated_N2.dir")
+            strain["Y_l2_m2.dat"] = np.stack(
+                [t, 3.0 * np.cos(t), 3.0 * np.sin(t)], axis=-1
+            )
+            strain["Y_l2_m1.dat"] = np.stack(
+                [t, np.zeros_like(t), -0.5 * np.ones_like(t)], axis=-1
+            )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_waveform_metadata(self):
+        metadata = waveform_metadata.waveform_metadata(
+            self.filename, "Extrapolated_N2.dir"
+        )
+        self.assertEqual(metadata["StartTime"], -10.0)
+        self.assertEqual(metadata["EndTime"], 30.0)
+        self.assertEqual(metadata["NumTimes"], 81)
+        self.assertTrue(metadata["UniformlySampled"])
+        self.assertAlmostEqual(metadata["Timestep"], 0.5)
+        self.assertEqual(sorted(metadata["Modes"]), ["Y_l2_m1", "Y_l2_m2"])
+        self.assertAlmostEqual(metadata["MaxAmplitudes"]["Y_l2_m2"], 3.0)
+        self.assertAlmostEqual(metadata["MaxAmplitudes"]["Y_l2_m1"], 0.5)
+        self.assertTrue(os.path.exists(self.filename + ".metadata.json"))
+        # Load from the sidecar file in a "new process"
+        waveform_metadata._cached_metadata.clear()
+        self.assertEqual(
+            waveform_metadata.waveform_metadata(
+                self.filename, "Extrapolated_N2.dir"
+            ),
+            metadata,
+        )
+
+    def test_bundle_directory(self):
+        bundle_dir = os.path.join(self.tmp_dir.name, "Waveform")
+        os.makedirs(bundle_dir)
+        t = np.linspace(-10.0, 30.0, 81)
+        np.save(os.path.join(bundle_dir, "Time.npy"), t)
+        np.save(os.path.join(bundle_dir, "Y_l2_m2.npy"), 2.0 * np.exp(1j * t))
+        metadata = waveform_metadata.waveform_metadata(
+            bundle_dir + os.sep, None
+        )
+        self.assertAlmostEqual(metadata["MaxAmplitudes"]["Y_l2_m2"], 2.0)
+        # The sidecar file is placed next to the directory, not inside it
+        self.assertTrue(os.path.exists(bundle_dir + ".metadata.json"))
+        self.assertEqual(os.listdir(bundle_dir).count(".metadata.json"), 0)
+        self.assertEqual(
+            waveform_metadata.waveform_metadata(bundle_dir, None), metadata
+        )
+
+    def test_waveform_time_range(self):
+        self.assertEqual(
+            waveform_metadata.waveform_time_range(
+                self.filename, "Extrapolated_N2.dir"
+            ),
+            (-10.0, 30.0),
+        )
+        # Doesn't scan the modes
+        self.assertFalse(os.path.exists(self.filename + ".metadata.json"))
+
+
+if __name__ == "__main__":
+    unittest.main()